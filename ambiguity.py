@@ -0,0 +1,334 @@
+from typing import Dict, Iterator, List, Optional, Set, Tuple, Union
+from collections import defaultdict
+from itertools import islice
+import math
+import time
+
+Production = Tuple[str, str]
+Tree = Union[str, Tuple[str, List]]
+
+# Número de derivaciones cuando un ciclo (A =>+ A sobre el mismo tramo) las hace infinitas
+INFINITE = math.inf
+
+
+def _check_context_free(grammar: Dict) -> None:
+    for left, _ in grammar["productions"]:
+        if not (len(left) == 1 and left.isupper()):
+            raise ValueError(
+                "El análisis de ambigüedad solo aplica a gramáticas libres de contexto (Tipo 2 o Tipo 3)."
+            )
+
+
+def _group_rules(productions: List[Production]) -> Dict[str, List[str]]:
+    rules: Dict[str, List[str]] = defaultdict(list)
+    for left, rhs in productions:
+        if rhs not in rules[left]:
+            rules[left].append(rhs)
+    return rules
+
+
+class ParseForest:
+    """
+    Bosque de análisis compartido (estilo CYK generalizado) para una cadena.
+
+    Para cada ítem (A, i, j) guarda cuántos árboles de derivación distintos
+    (equivalentemente, derivaciones más a la izquierda) tiene A =>* w[i:j].
+    Los ítems se comparten entre todos los árboles, así que el coste es
+    polinómico en |w| aunque el número de árboles sea exponencial.
+
+    Las producciones ε y unitarias crean dependencias dentro del mismo tramo
+    (A -> B con B sobre w[i:j]); se resuelven por punto fijo y, si un ciclo
+    sigue sumando derivaciones, el conteo se marca como INFINITE.
+    """
+
+    def __init__(self, grammar: Dict, word: str):
+        _check_context_free(grammar)
+        self.word = word
+        self.rules = _group_rules(grammar["productions"])
+        self.nonterminals = sorted(set(self.rules) | {
+            ch for _, rhs in grammar["productions"] for ch in rhs if ch.isupper()
+        })
+        self.count: Dict[Tuple[str, int, int], float] = {}
+
+        n = len(word)
+        for length in range(n + 1):
+            for i in range(n - length + 1):
+                self._solve_span(i, i + length)
+
+    def derivations(self, symbol: str, i: int = 0, j: int = None) -> float:
+        if j is None:
+            j = len(self.word)
+        return self.count.get((symbol, i, j), 0)
+
+    # --- conteo ---
+    def _sequence_count(self, rhs: str, i: int, j: int) -> float:
+        """
+        Número de formas de derivar w[i:j] con la secuencia de símbolos rhs.
+        """
+        word = self.word
+        ways: Dict[int, float] = {i: 1}
+        for sym in rhs:
+            nxt: Dict[int, float] = defaultdict(int)
+            for p, c in ways.items():
+                if not sym.isupper():
+                    if p < j and word[p] == sym:
+                        nxt[p + 1] += c
+                    continue
+                for q in range(p, j + 1):
+                    k = self.count.get((sym, p, q), 0)
+                    if k:
+                        nxt[q] += c * k
+            ways = nxt
+            if not ways:
+                return 0
+        return ways.get(j, 0)
+
+    def _round(self, i: int, j: int) -> Dict[str, float]:
+        return {
+            A: sum(self._sequence_count(rhs, i, j) for rhs in self.rules.get(A, []))
+            for A in self.nonterminals
+        }
+
+    def _store(self, values: Dict[str, float], i: int, j: int) -> None:
+        for A, c in values.items():
+            if c:
+                self.count[(A, i, j)] = c
+            else:
+                self.count.pop((A, i, j), None)
+
+    def _solve_span(self, i: int, j: int) -> None:
+        # Sin ciclos, una cadena de dependencias en el mismo tramo tiene a lo sumo
+        # |N| eslabones: si tras |N| + 1 rondas algo sigue cambiando, hay un ciclo.
+        rounds = len(self.nonterminals) + 1
+        values = {A: 0 for A in self.nonterminals}
+        changed: Set[str] = set()
+        for _ in range(rounds):
+            self._store(values, i, j)
+            new = self._round(i, j)
+            changed = {A for A in new if new[A] != values[A]}
+            values = new
+            if not changed:
+                break
+
+        if changed:
+            for A in changed:
+                values[A] = INFINITE
+            # Propagar el infinito a quien dependa de esos ítems
+            for _ in range(rounds):
+                self._store(values, i, j)
+                new = self._round(i, j)
+                if new == values:
+                    break
+                values = new
+
+        self._store(values, i, j)
+
+    # --- extracción de árboles ---
+    def trees(self, symbol: str, i: int = 0, j: int = None, path: Tuple = ()) -> Iterator[Tree]:
+        """
+        Enumera perezosamente los árboles de symbol =>* w[i:j].
+        Cada ítem puede repetirse como mucho dos veces en una rama, lo que basta
+        para mostrar un ciclo una vez sin caer en una enumeración infinita.
+        """
+        if j is None:
+            j = len(self.word)
+        if not symbol.isupper():
+            if j == i + 1 and self.word[i] == symbol:
+                yield symbol
+            return
+        key = (symbol, i, j)
+        if not self.count.get(key) or path.count(key) >= 2:
+            return
+        path = path + (key,)
+        for rhs in self.rules.get(symbol, []):
+            for children in self._sequence_trees(rhs, i, j, path):
+                yield (symbol, children)
+
+    def _sequence_trees(self, rhs: str, p: int, j: int, path: Tuple) -> Iterator[List[Tree]]:
+        if not rhs:
+            if p == j:
+                yield []
+            return
+        sym, rest = rhs[0], rhs[1:]
+        if sym.isupper():
+            ends = [q for q in range(p, j + 1) if self.count.get((sym, p, q))]
+        else:
+            ends = [p + 1] if p < j and self.word[p] == sym else []
+        for q in ends:
+            if not self._sequence_count(rest, q, j):
+                continue
+            for subtree in self.trees(sym, p, q, path):
+                for others in self._sequence_trees(rest, q, j, path):
+                    yield [subtree] + others
+
+
+def count_derivations(grammar: Dict, word: str) -> float:
+    """
+    Número de derivaciones más a la izquierda distintas de word desde el símbolo inicial.
+    Devuelve INFINITE si un ciclo de producciones ε/unitarias las hace ilimitadas.
+    """
+    return ParseForest(grammar, word).derivations(grammar["start"])
+
+
+def format_tree(tree: Tree) -> str:
+    """
+    Representa un árbol como S(a S(a b) b); las producciones vacías se muestran como ε.
+    """
+    if isinstance(tree, str):
+        return tree
+    symbol, children = tree
+    inner = " ".join(format_tree(c) for c in children) or "ε"
+    return f"{symbol}({inner})"
+
+
+class _BudgetExceeded(Exception):
+    def __init__(self, reason: str = "max_candidates"):
+        super().__init__(reason)
+        self.reason = reason
+
+
+def _strings_of_length(
+    rhs: str, n: int, lang: Dict[Tuple[str, int], Set[str]], limit: Optional[int] = None
+) -> Set[str]:
+    partial: Dict[int, Set[str]] = {0: {""}}
+    for sym in rhs:
+        nxt: Dict[int, Set[str]] = defaultdict(set)
+        for l, prefixes in partial.items():
+            if not sym.isupper():
+                if l + 1 <= n:
+                    nxt[l + 1] |= {p + sym for p in prefixes}
+                continue
+            for k in range(n - l + 1):
+                suffixes = lang.get((sym, k))
+                if suffixes:
+                    if limit is not None and len(prefixes) * len(suffixes) > limit:
+                        raise _BudgetExceeded
+                    nxt[l + k] |= {p + s for p in prefixes for s in suffixes}
+        partial = nxt
+        if not partial:
+            break
+    return partial.get(n, set())
+
+
+def _lengths(
+    grammar: Dict, max_len: int, max_strings: Optional[int] = None, deadline: Optional[float] = None
+) -> Iterator[Tuple[int, Optional[Set[str]], Optional[str]]]:
+    """
+    Genera (n, cadenas de longitud n, None) de una en una, así quien consume puede
+    parar en cuanto le basta. Si se supera max_strings (total de cadenas guardadas
+    de todos los no terminales) o el plazo, genera (n, None, motivo) y termina.
+    """
+    _check_context_free(grammar)
+    rules = _group_rules(grammar["productions"])
+    lang: Dict[Tuple[str, int], Set[str]] = {}
+    start = grammar["start"]
+    stored = 0
+
+    for n in range(max_len + 1):
+        limit = None if max_strings is None else max_strings - stored
+        try:
+            # Punto fijo dentro de la misma longitud (producciones ε y unitarias)
+            changed = True
+            while changed:
+                changed = False
+                for A, alternatives in rules.items():
+                    if deadline is not None and time.monotonic() > deadline:
+                        raise _BudgetExceeded("timeout")
+                    current = lang.setdefault((A, n), set())
+                    before = len(current)
+                    for rhs in alternatives:
+                        current |= _strings_of_length(rhs, n, lang, limit)
+                    if len(current) != before:
+                        changed = True
+                if limit is not None and sum(len(lang[(A, n)]) for A in rules) > limit:
+                    raise _BudgetExceeded
+        except _BudgetExceeded as e:
+            yield n, None, e.reason
+            return
+        stored += sum(len(lang[(A, n)]) for A in rules)
+        yield n, lang.get((start, n), set()), None
+
+
+def language_by_length(
+    grammar: Dict, max_len: int, max_strings: Optional[int] = None, timeout: Optional[float] = None
+) -> Dict[int, Set[str]]:
+    """
+    Cadenas del lenguaje agrupadas por longitud (0..max_len), calculadas de abajo
+    arriba por longitud en lugar de expandir formas sentenciales.
+
+    Con max_strings o timeout se deja de calcular al agotar el presupuesto:
+    el resultado solo contiene las longitudes que se completaron.
+    """
+    deadline = None if timeout is None else time.monotonic() + timeout
+    return {
+        n: strings
+        for n, strings, _ in _lengths(grammar, max_len, max_strings, deadline)
+        if strings is not None
+    }
+
+
+def find_ambiguity(
+    grammar: Dict,
+    max_len: int = 6,
+    max_examples: int = 3,
+    max_candidates: Optional[int] = 20000,
+    timeout: Optional[float] = None,
+) -> Dict:
+    """
+    Busca las cadenas ambiguas más cortas (longitud <= max_len).
+
+    Cada cadena candidata se analiza con un bosque compartido que cuenta sus
+    derivaciones más a la izquierda; para las primeras max_examples cadenas
+    ambiguas se extraen dos árboles de ejemplo.
+
+    La búsqueda está acotada por max_candidates (cadenas generadas) y timeout
+    (segundos); "checked_len" es la mayor longitud revisada por completo y
+    "complete" indica si se llegó a max_len. Que no se encuentre ambigüedad
+    solo garantiza que no la hay hasta checked_len.
+    """
+    deadline = None if timeout is None else time.monotonic() + timeout
+    start = grammar["start"]
+
+    checked = 0
+    checked_len = -1
+    reason = None
+    shortest: List[str] = []
+    counts: Dict[str, float] = {}
+    examples: List[Dict] = []
+
+    # Las candidatas se generan longitud a longitud: si aparece ambigüedad
+    # (o se agota el plazo) no se calculan las longitudes siguientes
+    for n, strings, reason in _lengths(grammar, max_len, max_candidates, deadline):
+        if strings is None:
+            break
+        for w in sorted(strings):
+            if deadline is not None and time.monotonic() > deadline:
+                reason = "timeout"
+                break
+            checked += 1
+            forest = ParseForest(grammar, w)
+            c = forest.derivations(start)
+            if c < 2:
+                continue
+            shortest.append(w)
+            counts[w] = c
+            if len(examples) < max_examples:
+                trees = [format_tree(t) for t in islice(forest.trees(start), 2)]
+                examples.append({"string": w, "count": c, "trees": trees})
+        if reason:
+            break
+        checked_len = n
+        if shortest:
+            break
+
+    return {
+        "ambiguous": bool(shortest),
+        "shortest": shortest,
+        "counts": counts,
+        "examples": examples,
+        "checked": checked,
+        "checked_len": checked_len,
+        "complete": reason is None,
+        "reason": reason,
+        "max_len": max_len,
+    }
@@ -0,0 +1,60 @@
+from typing import Any, Callable, Dict, Optional
+from concurrent.futures import Future, ThreadPoolExecutor
+import threading
+import time
+
+# Pool compartido por todas las sesiones: limita cuántos cálculos largos corren a la vez
+# para que los hilos del servidor de Streamlit sigan atendiendo a los usuarios.
+MAX_WORKERS = 4
+_EXECUTOR = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="chomsky-worker")
+
+
+class BackgroundTask:
+    """
+    Cálculo en segundo plano con cancelación cooperativa.
+
+    La función recibe cancel_event y on_progress como argumentos con nombre;
+    progress() devuelve la última instantánea enviada a on_progress, de modo que
+    la interfaz puede mostrar resultados parciales mientras se calcula.
+    """
+
+    def __init__(self, fn: Callable, *args, **kwargs):
+        self._cancel = threading.Event()
+        self._lock = threading.Lock()
+        self._progress: Dict = {}
+        self.started_at = time.monotonic()
+        kwargs.update(cancel_event=self._cancel, on_progress=self._report)
+        self._future: Future = _EXECUTOR.submit(fn, *args, **kwargs)
+
+    def _report(self, info: Dict) -> None:
+        with self._lock:
+            self._progress = info
+
+    def progress(self) -> Dict:
+        with self._lock:
+            return dict(self._progress)
+
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started_at
+
+    def running(self) -> bool:
+        return self._future.running()
+
+    def done(self) -> bool:
+        return self._future.done()
+
+    def cancel(self) -> None:
+        """
+        Pide al cálculo que se detenga; devolverá lo encontrado marcado como parcial.
+        """
+        self._cancel.set()
+
+    def cancelled(self) -> bool:
+        return self._cancel.is_set()
+
+    def result(self, timeout: Optional[float] = None) -> Any:
+        return self._future.result(timeout=timeout)
+
+
+def run_in_background(fn: Callable, *args, **kwargs) -> BackgroundTask:
+    return BackgroundTask(fn, *args, **kwargs)
@@ -1,5 +1,11 @@
-from typing import Dict, List, Tuple, Set
+from typing import Callable, Dict, List, Optional, Tuple, Set
+import heapq
+import math
+import os
 import random
+import time
+
+from grammar_analysis import language_summary, yield_tables
 
 Production = Tuple[str, str]
 
@@ -226,27 +232,111 @@ def _has_nonterminal(s: str, nonterminals: Set[str]) -> bool:
     return any(ch in nonterminals for ch in s)
 
 
-def generate_strings(grammar: Dict, max_len: int = 5, max_steps: int = 6) -> Set[str]:
+# Cada cuántas expansiones se comprueban plazo/cancelación y se informa del progreso
+_CHECK_EVERY = 256
+_PROGRESS_EVERY = 2048
+
+
+def generate_strings_bounded(
+    grammar: Dict,
+    max_len: Optional[int] = 5,
+    max_steps: Optional[int] = 6,
+    timeout: Optional[float] = None,
+    max_expansions: Optional[int] = None,
+    cancel_event=None,
+    on_progress: Optional[Callable[[Dict], None]] = None,
+) -> Dict:
     """
-    Genera cadenas desde la gramática de forma heurística, hasta cierta profundidad.
-    Solo sirve para comparación aproximada.
+    Igual que generate_strings, pero con presupuesto y cancelación cooperativa:
+      - timeout: segundos de reloj como máximo.
+      - max_expansions: número máximo de formas sentenciales expandidas.
+      - cancel_event: objeto con is_set() (p. ej. threading.Event) para detener el cálculo.
+      - on_progress: recibe periódicamente {"expansions", "found", "pending", "strings"}.
+
+    Si se detiene antes de terminar devuelve lo encontrado hasta ese momento con
+    "partial" = True y "reason" = "timeout" | "budget" | "cancelled".
+
+    En gramáticas libres de contexto se usa language_summary: un lenguaje vacío
+    no se explora, y si el lenguaje es finito con tamaño conocido la búsqueda
+    termina en cuanto aparecen todas sus cadenas ("exhausted" = True).
+    Con max_len / max_steps = None los límites se eligen a partir del análisis.
     """
     start = grammar["start"]
     prods = grammar["productions"]
     nonterminals = set(grammar["nonterminals"])
     results: Set[str] = set()
-
-    from collections import deque
-    queue = deque()
-    queue.append((start, 0))
+    deadline = time.monotonic() + timeout if timeout is not None else None
+
+    summary = language_summary(grammar)
+    if max_len is None:
+        finite = summary is not None and summary["finite"] and summary["max_length"] is not None
+        max_len = summary["max_length"] if finite else 5
+    if max_steps is None:
+        known = summary is not None and summary["max_steps"] is not None
+        max_steps = summary["max_steps"] if known else 6
+
+    # Cadenas que quedan por encontrar cuando se conoce el tamaño exacto del lenguaje
+    target = None
+    if summary is not None and summary["size_by_length"] is not None:
+        target = sum(c for n, c in summary["size_by_length"].items() if 0 < n <= max_len)
+
+    # Búsqueda primero-el-mejor: se expande antes la forma cuya cadena final
+    # tiene la menor longitud posible (cota inferior con min_yield). Las formas
+    # cuya cota supera max_len no pueden dar resultados y se descartan.
+    tables = yield_tables(grammar)
+    min_yield = tables["min_yield"] if tables is not None else {}
+    by_left: Dict[str, List[str]] = {}
+    for left, rhs in prods:
+        by_left.setdefault(left, []).append(rhs)
+
+    def lower_bound(form: str) -> float:
+        if tables is None:
+            return 0
+        return sum(min_yield.get(ch, math.inf) if ch in nonterminals else 1 for ch in form)
+
+    rhs_bound = {rhs: lower_bound(rhs) for _, rhs in prods}
+
+    queue: List[Tuple[float, int, int, str]] = []
+    # Menor número de pasos con que se ha visto cada forma: volver a verla con
+    # más pasos no puede producir cadenas nuevas
+    best_steps: Dict[str, int] = {}
+    tie = 0
+    if target != 0 and lower_bound(start) <= max_len:
+        queue.append((lower_bound(start), 0, tie, start))
+        best_steps[start] = 0
+    expansions = 0
+    reason = None
 
     while queue:
-        current, steps = queue.popleft()
+        if max_expansions is not None and expansions >= max_expansions:
+            reason = "budget"
+            break
+        if expansions % _CHECK_EVERY == 0:
+            if cancel_event is not None and cancel_event.is_set():
+                reason = "cancelled"
+            elif deadline is not None and time.monotonic() > deadline:
+                reason = "timeout"
+            if reason:
+                break
+        if on_progress is not None and expansions % _PROGRESS_EVERY == 0:
+            on_progress({
+                "expansions": expansions,
+                "found": len(results),
+                "pending": len(queue),
+                "strings": set(results),
+            })
+        expansions += 1
+
+        bound, steps, _, current = heapq.heappop(queue)
+        if steps > best_steps.get(current, steps):
+            continue
         if steps > max_steps:
             continue
         if not _has_nonterminal(current, nonterminals):
             if 0 < len(current) <= max_len:
                 results.add(current)
+                if target is not None and len(results) >= target:
+                    break
             continue
         if len(current) > max_len + 2:
             continue
@@ -260,27 +350,76 @@ def generate_strings(grammar: Dict, max_len: int = 5, max_steps: int = 6) -> Set
             continue
 
         A = current[idx_nt]
-        for left, rhs in prods:
-            if left == A:
-                new_string = current[:idx_nt] + rhs + current[idx_nt + 1:]
-                queue.append((new_string, steps + 1))
+        for rhs in by_left.get(A, []):
+            new_bound = bound - min_yield.get(A, 0) + rhs_bound[rhs] if tables is not None else 0
+            if new_bound > max_len:
+                continue
+            new_string = current[:idx_nt] + rhs + current[idx_nt + 1:]
+            if best_steps.get(new_string, steps + 2) <= steps + 1:
+                continue
+            best_steps[new_string] = steps + 1
+            tie += 1
+            heapq.heappush(queue, (new_bound, steps + 1, tie, new_string))
 
-    return results
+    return {
+        "strings": results,
+        "partial": reason is not None,
+        "reason": reason,
+        "expansions": expansions,
+        "exhausted": target is not None and len(results) >= target,
+        "max_len": max_len,
+        "max_steps": max_steps,
+    }
 
 
-def compare_grammars(g1: Dict, g2: Dict, max_len: int = 5, max_steps: int = 6) -> Dict:
+def generate_strings(grammar: Dict, max_len: Optional[int] = 5, max_steps: Optional[int] = 6) -> Set[str]:
+    """
+    Genera cadenas desde la gramática de forma heurística, hasta cierta profundidad.
+    Solo sirve para comparación aproximada.
+    """
+    return generate_strings_bounded(grammar, max_len=max_len, max_steps=max_steps)["strings"]
+
+
+def compare_grammars(
+    g1: Dict,
+    g2: Dict,
+    max_len: int = 5,
+    max_steps: int = 6,
+    timeout: Optional[float] = None,
+    cancel_event=None,
+    on_progress: Optional[Callable[[Dict], None]] = None,
+) -> Dict:
     """
     Compara dos gramáticas generando cadenas hasta cierta longitud y profundidad.
     Devuelve un informe con las diferencias.
+
+    Con timeout/cancel_event el informe puede ser parcial ("partial" = True):
+    el plazo se reparte entre ambas gramáticas y on_progress recibe además
+    "grammar" (1 o 2) para saber cuál se está generando.
     """
-    L1 = generate_strings(g1, max_len=max_len, max_steps=max_steps)
-    L2 = generate_strings(g2, max_len=max_len, max_steps=max_steps)
+    deadline = time.monotonic() + timeout if timeout is not None else None
+    runs = []
+    for n, g in ((1, g1), (2, g2)):
+        remaining = None
+        if deadline is not None:
+            # La primera gramática solo puede usar la mitad del plazo
+            share = 2 if n == 1 else 1
+            remaining = max(0.0, (deadline - time.monotonic()) / share)
+        report = None
+        if on_progress is not None:
+            report = lambda info, n=n: on_progress(dict(info, grammar=n))
+        runs.append(generate_strings_bounded(
+            g, max_len=max_len, max_steps=max_steps, timeout=remaining,
+            cancel_event=cancel_event, on_progress=report,
+        ))
+    L1, L2 = runs[0]["strings"], runs[1]["strings"]
 
     only1 = sorted(L1 - L2)
     only2 = sorted(L2 - L1)
     common = sorted(L1 & L2)
 
     equivalent = (only1 == [] and only2 == [])
+    reasons = [r["reason"] for r in runs if r["partial"]]
 
     return {
         "equivalent": equivalent,
@@ -288,5 +427,243 @@ def compare_grammars(g1: Dict, g2: Dict, max_len: int = 5, max_steps: int = 6) -
         "only2": only2,
         "common": common,
         "max_len": max_len,
+        "partial": bool(reasons),
+        "reason": reasons[0] if reasons else None,
+        "analysis1": language_summary(g1),
+        "analysis2": language_summary(g2),
     }
 
+
+
+#COMPARACIÓN DE VARIAS GRAMÁTICAS
+# Lenguajes acotados ya generados, compartidos entre llamadas:
+# (inicio, producciones, no terminales, max_len, max_steps) -> cadenas
+_LANGUAGE_CACHE: Dict[Tuple, frozenset] = {}
+_LANGUAGE_CACHE_MAX = 4096
+
+# Por debajo de este número de tareas no compensa arrancar procesos
+_PARALLEL_MIN_TASKS = 4
+
+# La matriz de diferencias solo se reparte entre procesos si el trabajo
+# (pares de clases × tamaño medio del lenguaje) es mayor que esto
+_PARALLEL_MIN_MATRIX_WORK = 2_000_000
+
+# Cada cuánto se comprueba la cancelación mientras trabajan los procesos
+_POLL_SECONDS = 0.2
+
+# Lenguajes representantes de cada clase, copiados una vez en cada proceso
+_WORKER_LANGUAGES: List[frozenset] = []
+
+# Evento de cancelación compartido con los procesos que generan lenguajes
+_WORKER_CANCEL = None
+
+
+def _grammar_key(grammar: Dict) -> Tuple:
+    return (
+        grammar["start"],
+        tuple(sorted(set(grammar["productions"]))),
+        tuple(sorted(grammar["nonterminals"])),
+    )
+
+
+def language_fingerprint(strings) -> str:
+    """
+    Huella corta de un conjunto de cadenas: dos lenguajes acotados iguales
+    tienen la misma huella.
+    """
+    import hashlib
+
+    data = "\n".join(sorted(strings)).encode("utf-8")
+    return hashlib.sha1(data).hexdigest()[:16]
+
+
+def _generate_language(args: Tuple, cancel_event=None) -> Tuple[frozenset, Optional[str]]:
+    grammar, max_len, max_steps, deadline = args
+    if cancel_event is None:
+        cancel_event = _WORKER_CANCEL
+    timeout = None
+    if deadline is not None:
+        # time.time() y no monotonic(): el plazo viaja entre procesos
+        timeout = max(0.0, deadline - time.time())
+    run = generate_strings_bounded(
+        grammar, max_len=max_len, max_steps=max_steps, timeout=timeout, cancel_event=cancel_event
+    )
+    return frozenset(run["strings"]), run["reason"]
+
+
+def _init_worker_cancel(event) -> None:
+    global _WORKER_CANCEL
+    _WORKER_CANCEL = event
+
+
+def _init_worker_languages(languages: List[frozenset]) -> None:
+    global _WORKER_LANGUAGES
+    _WORKER_LANGUAGES = languages
+
+
+def _difference_row(i: int) -> List[int]:
+    # Solo el triángulo superior: |L_i Δ L_j| es simétrica y nula en la diagonal
+    Li = _WORKER_LANGUAGES[i]
+    return [len(Li ^ Lj) for Lj in _WORKER_LANGUAGES[i + 1:]]
+
+
+def _process_context():
+    """
+    Contexto de multiprocessing sin fork: los cálculos se lanzan desde hilos del
+    servidor de Streamlit y hacer fork de un proceso con varios hilos puede
+    dejar bloqueado al hijo.
+    """
+    import multiprocessing
+
+    method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+    return multiprocessing.get_context(method)
+
+
+def _resolve_workers(workers: Optional[int], tasks: int) -> int:
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if tasks < _PARALLEL_MIN_TASKS:
+        return 1
+    return max(1, min(workers, tasks))
+
+
+def compare_many_grammars(
+    grammars: List[Dict],
+    max_len: int = 5,
+    max_steps: int = 6,
+    workers: Optional[int] = None,
+    timeout: Optional[float] = None,
+    cancel_event=None,
+    on_progress: Optional[Callable[[Dict], None]] = None,
+) -> Dict:
+    """
+    Compara N gramáticas a la vez (por ejemplo, entregas de estudiantes y una referencia).
+
+    - El lenguaje acotado de cada gramática distinta se genera UNA sola vez
+      (gramáticas repetidas y llamadas anteriores reutilizan la caché).
+    - Cada lenguaje se resume en una huella; gramáticas con la misma huella
+      forman una clase de equivalencia (aproximada, hasta max_len).
+    - La matriz de diferencias |L_i Δ L_j| se calcula entre clases (solo el
+      triángulo superior; en paralelo con procesos si hay trabajo suficiente)
+      y se expande a las N gramáticas.
+
+    Con timeout/cancel_event la generación se detiene y el informe es parcial
+    ("partial" = True, "incomplete" = índices con lenguaje incompleto); los
+    lenguajes parciales no se guardan en la caché. on_progress recibe
+    {"done", "total"} cada vez que termina un lenguaje.
+    """
+    # Los procesos solo se necesitan aquí: importar multiprocessing al cargar el
+    # módulo encarecería el arranque de todos los modos de la aplicación
+    from concurrent.futures import ProcessPoolExecutor, wait
+
+    if not grammars:
+        raise ValueError("No hay gramáticas que comparar.")
+
+    keys = [_grammar_key(g) + (max_len, max_steps) for g in grammars]
+
+    pending: Dict[Tuple, Dict] = {}
+    for key, g in zip(keys, grammars):
+        if key not in _LANGUAGE_CACHE:
+            pending.setdefault(key, g)
+
+    deadline = time.time() + timeout if timeout is not None else None
+    tasks = [(g, max_len, max_steps, deadline) for g in pending.values()]
+    total = len(tasks)
+    n_workers = _resolve_workers(workers, total)
+    generated: List[Tuple[frozenset, Optional[str]]] = []
+    if n_workers > 1:
+        context = _process_context()
+        # El threading.Event de la sesión no cruza procesos: se refleja en un
+        # evento de multiprocessing que los procesos consultan mientras generan
+        worker_cancel = context.Event()
+        pool = ProcessPoolExecutor(
+            max_workers=n_workers,
+            mp_context=context,
+            initializer=_init_worker_cancel,
+            initargs=(worker_cancel,),
+        )
+        try:
+            futures = [pool.submit(_generate_language, t) for t in tasks]
+            not_done = set(futures)
+            while not_done:
+                if cancel_event is not None and cancel_event.is_set():
+                    worker_cancel.set()
+                    break
+                done, not_done = wait(not_done, timeout=_POLL_SECONDS)
+                if done and on_progress is not None:
+                    on_progress({"done": total - len(not_done), "total": total})
+        finally:
+            # Las tareas sin empezar se descartan; las que corren ven el evento y
+            # terminan enseguida con lo encontrado, así no queda CPU ocupada
+            pool.shutdown(wait=True, cancel_futures=True)
+        generated = [
+            f.result() if not f.cancelled() else (frozenset(), "cancelled")
+            for f in futures
+        ]
+    else:
+        for i, t in enumerate(tasks):
+            if cancel_event is not None and cancel_event.is_set():
+                generated.append((frozenset(), "cancelled"))
+            else:
+                generated.append(_generate_language(t, cancel_event))
+            if on_progress is not None:
+                on_progress({"done": i + 1, "total": total})
+
+    languages = {key: _LANGUAGE_CACHE[key] for key in keys if key in _LANGUAGE_CACHE}
+    reasons: Dict[Tuple, str] = {}
+    complete: Dict[Tuple, frozenset] = {}
+    for key, (strings, reason) in zip(pending, generated):
+        languages[key] = strings
+        if reason is None:
+            complete[key] = strings
+        else:
+            reasons[key] = reason
+    if len(_LANGUAGE_CACHE) + len(complete) > _LANGUAGE_CACHE_MAX:
+        _LANGUAGE_CACHE.clear()
+    _LANGUAGE_CACHE.update(complete)
+
+    # Agrupar por huella del lenguaje
+    cluster_by_fp: Dict[str, int] = {}
+    clusters: List[Dict] = []
+    cluster_of: List[int] = []
+    for i, key in enumerate(keys):
+        fp = language_fingerprint(languages[key])
+        if fp not in cluster_by_fp:
+            cluster_by_fp[fp] = len(clusters)
+            clusters.append({"fingerprint": fp, "members": [], "size": len(languages[key]), "key": key})
+        c = cluster_by_fp[fp]
+        clusters[c]["members"].append(i)
+        cluster_of.append(c)
+
+    representatives = [languages[c.pop("key")] for c in clusters]
+    k = len(representatives)
+    work = k * (k - 1) // 2 * (sum(len(L) for L in representatives) // k)
+    n_workers = _resolve_workers(workers, k) if work > _PARALLEL_MIN_MATRIX_WORK else 1
+    if n_workers > 1:
+        with ProcessPoolExecutor(
+            max_workers=n_workers,
+            mp_context=_process_context(),
+            initializer=_init_worker_languages,
+            initargs=(representatives,),
+        ) as pool:
+            upper = list(pool.map(_difference_row, range(k)))
+    else:
+        upper = [[len(Li ^ Lj) for Lj in representatives[i + 1:]] for i, Li in enumerate(representatives)]
+    cluster_matrix = [[0] * k for _ in range(k)]
+    for i, row in enumerate(upper):
+        for offset, d in enumerate(row):
+            cluster_matrix[i][i + 1 + offset] = cluster_matrix[i + 1 + offset][i] = d
+
+    matrix = [[cluster_matrix[ci][cj] for cj in cluster_of] for ci in cluster_of]
+
+    return {
+        "clusters": clusters,
+        "cluster_of": cluster_of,
+        "cluster_matrix": cluster_matrix,
+        "matrix": matrix,
+        "languages": [sorted(languages[key]) for key in keys],
+        "max_len": max_len,
+        "partial": bool(reasons),
+        "reason": next(iter(reasons.values()), None),
+        "incomplete": [i for i, key in enumerate(keys) if key in reasons],
+    }
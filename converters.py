@@ -0,0 +1,634 @@
+from typing import Dict, FrozenSet, List, Optional, Set, Tuple
+from collections import defaultdict, deque
+
+EPSILON = "ε"
+
+# Tamaño máximo (nodos del árbol, aproximadamente sus símbolos) de la expresión que
+# produce dfa_to_regex: la eliminación de estados puede crecer exponencialmente.
+MAX_REGEX_SIZE = 50000
+
+# Nombres de no terminales: letras A-Z (S queda para el estado inicial). Con más
+# estados la gramática dejaría de ser legible, así que dfa_to_grammar lo rechaza.
+_NT_NAMES = [chr(c) for c in range(ord("A"), ord("Z") + 1) if chr(c) != "S"]
+
+
+#EXPRESIONES REGULARES (ÁRBOL COMPARTIDO Y SIMPLIFICADO)
+class RegexBuilder:
+    """
+    Construye expresiones regulares como nodos compartidos (hash-consing): cada
+    subexpresión distinta existe una sola vez y se identifica con un entero.
+
+    Los constructores cat/alt/star simplifican al vuelo:
+      ∅·r = ∅,  ε·r = r,  r|∅ = r,  r|r = r,  r|r* = r*,  (r*)* = r*,  (ε|r)* = r*,
+      ε|r = r si r ya acepta ε.
+    """
+
+    EMPTY = 0
+    EPS = 1
+
+    def __init__(self):
+        self.nodes: List[Tuple[str, Tuple]] = [("empty", ()), ("eps", ())]
+        self.ids: Dict[Tuple[str, Tuple], int] = {n: i for i, n in enumerate(self.nodes)}
+        self.size: List[int] = [1, 1]
+        self.nullable: List[bool] = [False, True]
+        self._strings: Dict[Tuple[int, int], str] = {}
+
+    def _make(self, op: str, payload: Tuple, size: int, nullable: bool) -> int:
+        key = (op, payload)
+        node = self.ids.get(key)
+        if node is None:
+            node = len(self.nodes)
+            self.nodes.append(key)
+            self.ids[key] = node
+            self.size.append(size)
+            self.nullable.append(nullable)
+        return node
+
+    def sym(self, c: str) -> int:
+        return self._make("sym", (c,), 1, False)
+
+    def cat(self, *items: int) -> int:
+        parts: List[int] = []
+        for r in items:
+            if r == self.EMPTY:
+                return self.EMPTY
+            if r == self.EPS:
+                continue
+            op, payload = self.nodes[r]
+            parts.extend(payload if op == "cat" else (r,))
+        if not parts:
+            return self.EPS
+        if len(parts) == 1:
+            return parts[0]
+        return self._make(
+            "cat", tuple(parts),
+            sum(self.size[p] for p in parts),
+            all(self.nullable[p] for p in parts),
+        )
+
+    def alt(self, *items: int) -> int:
+        parts: Set[int] = set()
+        for r in items:
+            if r == self.EMPTY:
+                continue
+            op, payload = self.nodes[r]
+            parts.update(payload if op == "alt" else (r,))
+        # r | r* = r*
+        for r in list(parts):
+            if self.ids.get(("star", (r,))) in parts:
+                parts.discard(r)
+        if self.EPS in parts and any(self.nullable[p] for p in parts if p != self.EPS):
+            parts.discard(self.EPS)
+        if not parts:
+            return self.EMPTY
+        if len(parts) == 1:
+            return parts.pop()
+        ordered = tuple(sorted(parts, key=lambda p: (self.size[p], p)))
+        return self._make(
+            "alt", ordered,
+            sum(self.size[p] for p in ordered) + 1,
+            any(self.nullable[p] for p in ordered),
+        )
+
+    def star(self, r: int) -> int:
+        if r in (self.EMPTY, self.EPS):
+            return self.EPS
+        op, payload = self.nodes[r]
+        if op == "star":
+            return r
+        if op == "alt" and self.EPS in payload:
+            r = self.alt(*(p for p in payload if p != self.EPS))
+            if self.nodes[r][0] == "star":
+                return r
+        return self._make("star", (r,), self.size[r] + 1, True)
+
+    # --- impresión ---
+    def to_string(self, r: int) -> str:
+        return self._str(r, 0)
+
+    def _seq(self, r: int) -> Tuple[int, ...]:
+        op, payload = self.nodes[r]
+        return payload if op == "cat" else (r,)
+
+    def _str(self, r: int, prec: int) -> str:
+        """
+        prec: 0 = alternativa, 1 = concatenación, 2 = operador postfijo.
+        """
+        key = (r, prec)
+        if key not in self._strings:
+            self._strings[key] = self._render(r, prec)
+        return self._strings[key]
+
+    def _render(self, r: int, prec: int) -> str:
+        op, payload = self.nodes[r]
+        if op == "empty":
+            return "∅"
+        if op == "eps":
+            return EPSILON
+        if op == "sym":
+            return payload[0]
+        if op == "star":
+            return self._str(payload[0], 2) + "*"
+        if op == "alt":
+            rest = [p for p in payload if p != self.EPS]
+            if len(rest) < len(payload):
+                # ε|r se escribe r?
+                inner = rest[0] if len(rest) == 1 else self.alt(*rest)
+                return self._str(inner, 2) + "?"
+            text = "|".join(self._str(p, 0) for p in payload)
+            return f"({text})" if prec > 0 else text
+        # cat: detecta r r* y lo escribe r+
+        out: List[str] = []
+        plain = 0  # cuántas piezas finales de out son partes sueltas de payload
+        for i, p in enumerate(payload):
+            if self.nodes[p][0] == "star":
+                inner = self.nodes[p][1][0]
+                seq = self._seq(inner)
+                k = len(seq)
+                if k <= plain and payload[i - k:i] == seq:
+                    del out[len(out) - k:]
+                    out.append(self._str(inner, 2) + "+")
+                    plain = 0
+                    continue
+            out.append(self._str(p, 1))
+            plain += 1
+        text = "".join(out)
+        return f"({text})" if prec > 1 else text
+
+
+def parse_regex(text: str, builder: Optional[RegexBuilder] = None) -> Tuple[RegexBuilder, int]:
+    """
+    Lee una expresión regular con | * + ? paréntesis, ε y ∅.
+    Cualquier otro carácter (sin espacios) es un símbolo del alfabeto.
+    """
+    rb = builder or RegexBuilder()
+    tokens = [c for c in text if not c.isspace()]
+    pos = 0
+
+    def peek() -> Optional[str]:
+        return tokens[pos] if pos < len(tokens) else None
+
+    def parse_alt() -> int:
+        nonlocal pos
+        options = [parse_cat()]
+        while peek() == "|":
+            pos += 1
+            options.append(parse_cat())
+        return rb.alt(*options)
+
+    def parse_cat() -> int:
+        items = []
+        while peek() is not None and peek() not in "|)":
+            items.append(parse_rep())
+        return rb.cat(*items)
+
+    def parse_rep() -> int:
+        nonlocal pos
+        r = parse_atom()
+        while peek() is not None and peek() in "*+?":
+            op = tokens[pos]
+            pos += 1
+            if op == "*":
+                r = rb.star(r)
+            elif op == "+":
+                r = rb.cat(r, rb.star(r))
+            else:
+                r = rb.alt(rb.EPS, r)
+        return r
+
+    def parse_atom() -> int:
+        nonlocal pos
+        c = peek()
+        if c == "(":
+            pos += 1
+            r = parse_alt()
+            if peek() != ")":
+                raise ValueError("Falta un paréntesis de cierre en la expresión regular.")
+            pos += 1
+            return r
+        if c is None or c in "*+?)|":
+            raise ValueError(f"Símbolo inesperado en la expresión regular: {c or 'fin de texto'}")
+        pos += 1
+        if c in (EPSILON, "λ"):
+            return rb.EPS
+        if c == "∅":
+            return rb.EMPTY
+        return rb.sym(c)
+
+    root = parse_alt()
+    if pos != len(tokens):
+        raise ValueError(f"Símbolo inesperado en la expresión regular: {tokens[pos]}")
+    return rb, root
+
+
+#AUTÓMATAS
+def _new_nfa(start: str) -> Dict:
+    return {
+        "type": "AFN",
+        "states": [start],
+        "alphabet": [],
+        "start": start,
+        "accepting": [],
+        "transitions": {},
+    }
+
+
+def _add_edge(nfa: Dict, src: str, symbol: str, dst: str) -> None:
+    nfa["transitions"].setdefault(src, {}).setdefault(symbol, []).append(dst)
+
+
+def regex_to_nfa(text: str) -> Dict:
+    """
+    Construcción de Thompson: AFN con transiciones ε en el formato JSON de
+    parse_automaton_json (los destinos son listas y "ε" marca las transiciones vacías).
+    """
+    rb, root = parse_regex(text)
+    counter = [0]
+
+    def fresh() -> str:
+        name = f"q{counter[0]}"
+        counter[0] += 1
+        return name
+
+    start = fresh()
+    nfa = _new_nfa(start)
+    alphabet: Set[str] = set()
+
+    def build(r: int, src: str, dst: str) -> None:
+        op, payload = rb.nodes[r]
+        if op == "empty":
+            return
+        if op == "eps":
+            _add_edge(nfa, src, EPSILON, dst)
+        elif op == "sym":
+            alphabet.add(payload[0])
+            _add_edge(nfa, src, payload[0], dst)
+        elif op == "cat":
+            current = src
+            for i, p in enumerate(payload):
+                nxt = dst if i == len(payload) - 1 else fresh()
+                build(p, current, nxt)
+                current = nxt
+        elif op == "alt":
+            for p in payload:
+                build(p, src, dst)
+        else:  # star
+            loop = fresh()
+            _add_edge(nfa, src, EPSILON, loop)
+            _add_edge(nfa, loop, EPSILON, dst)
+            build(payload[0], loop, loop)
+
+    final = "qf"
+    build(root, start, final)
+    nfa["states"] = sorted(
+        {start, final} | set(nfa["transitions"]) |
+        {d for t in nfa["transitions"].values() for ds in t.values() for d in ds},
+        key=lambda s: (len(s), s),
+    )
+    nfa["alphabet"] = sorted(alphabet)
+    nfa["accepting"] = [final]
+    return nfa
+
+
+def grammar_to_nfa(grammar: Dict) -> Dict:
+    """
+    Gramática regular (forma lineal derecha, como la acepta parse_grammar) a AFN:
+      A -> wB  : camino A --w--> B  (A -> B es una transición ε)
+      A -> w   : camino A --w--> estado final
+      A -> ε   : A es de aceptación
+    """
+    from classifier import classify_grammar
+
+    if classify_grammar(grammar)[0] != 3:
+        raise ValueError("La gramática no es regular (Tipo 3): no se puede convertir a autómata finito.")
+
+    final = "Final"
+    while final in grammar["nonterminals"]:
+        final += "'"
+    nfa = _new_nfa(grammar["start"])
+    accepting: Set[str] = set()
+    alphabet: Set[str] = set()
+    states: Set[str] = {grammar["start"]}
+    counter = 0
+
+    for left, rhs in grammar["productions"]:
+        states.add(left)
+        if rhs == "":
+            accepting.add(left)
+            continue
+        if rhs[-1].isupper():
+            word, target = rhs[:-1], rhs[-1]
+        else:
+            word, target = rhs, final
+            accepting.add(final)
+        states.add(target)
+        if not word:
+            _add_edge(nfa, left, EPSILON, target)
+            continue
+        current = left
+        for i, a in enumerate(word):
+            alphabet.add(a)
+            if i == len(word) - 1:
+                nxt = target
+            else:
+                nxt = f"{left}{counter}"
+                counter += 1
+                states.add(nxt)
+            _add_edge(nfa, current, a, nxt)
+            current = nxt
+
+    nfa["states"] = sorted(states)
+    nfa["alphabet"] = sorted(alphabet)
+    nfa["accepting"] = sorted(accepting)
+    return nfa
+
+
+def _targets(value) -> List[str]:
+    if isinstance(value, (list, tuple, set)):
+        return list(value)
+    return [value]
+
+
+def nfa_to_dfa(nfa: Dict, max_states: Optional[int] = None) -> Dict:
+    """
+    Construcción de subconjuntos (con clausura ε). El AFD resultante es parcial:
+    las transiciones que faltan van a un estado de error implícito.
+    Con max_states se lanza ValueError si el AFD crece más de la cuenta.
+    """
+    transitions = nfa.get("transitions", {})
+    alphabet = sorted(
+        set(nfa.get("alphabet", [])) |
+        {a for t in transitions.values() for a in t if a != EPSILON}
+    )
+    accepting = set(nfa.get("accepting", []))
+
+    def closure(states: Set[str]) -> FrozenSet[str]:
+        stack = list(states)
+        seen = set(states)
+        while stack:
+            q = stack.pop()
+            for d in _targets(transitions.get(q, {}).get(EPSILON, [])):
+                if d not in seen:
+                    seen.add(d)
+                    stack.append(d)
+        return frozenset(seen)
+
+    start = closure({nfa["start"]})
+    names: Dict[FrozenSet[str], str] = {start: "q0"}
+    queue = deque([start])
+    dfa_trans: Dict[str, Dict[str, str]] = {}
+    dfa_accepting: List[str] = []
+
+    while queue:
+        current = queue.popleft()
+        name = names[current]
+        if current & accepting:
+            dfa_accepting.append(name)
+        row: Dict[str, str] = {}
+        for a in alphabet:
+            moved: Set[str] = set()
+            for q in current:
+                if a in transitions.get(q, {}):
+                    moved.update(_targets(transitions[q][a]))
+            if not moved:
+                continue
+            target = closure(moved)
+            if target not in names:
+                if max_states is not None and len(names) >= max_states:
+                    raise ValueError(f"El AFD supera el límite de {max_states} estados.")
+                names[target] = f"q{len(names)}"
+                queue.append(target)
+            row[a] = names[target]
+        dfa_trans[name] = row
+
+    return {
+        "type": "AFD",
+        "states": list(names.values()),
+        "alphabet": alphabet,
+        "start": "q0",
+        "accepting": dfa_accepting,
+        "transitions": dfa_trans,
+    }
+
+
+def automaton_to_dfa(automaton: Dict, max_states: Optional[int] = None) -> Dict:
+    """
+    Devuelve un AFD: si el autómata ya es determinista se usa tal cual,
+    si tiene transiciones ε o varios destinos se determiniza (con max_states).
+    """
+    transitions = automaton.get("transitions", {})
+    deterministic = all(
+        symbol != EPSILON and len(_targets(dst)) == 1
+        for row in transitions.values() for symbol, dst in row.items()
+    )
+    if not deterministic:
+        return nfa_to_dfa(automaton, max_states=max_states)
+    dfa = dict(automaton)
+    dfa["transitions"] = {
+        src: {a: _targets(dst)[0] for a, dst in row.items()}
+        for src, row in transitions.items()
+    }
+    return dfa
+
+
+def minimize_dfa(dfa: Dict) -> Dict:
+    """
+    Elimina estados inalcanzables y muertos y fusiona los equivalentes
+    (refinamiento de particiones de Moore). Los estados se renombran q0, q1, ...
+    en orden de recorrido desde el inicial.
+    """
+    transitions = dfa.get("transitions", {})
+    alphabet = sorted(
+        set(dfa.get("alphabet", [])) | {a for row in transitions.values() for a in row}
+    )
+    accepting = set(dfa.get("accepting", []))
+    start = dfa["start"]
+
+    # Alcanzables desde el inicial
+    reachable = {start}
+    queue = deque([start])
+    while queue:
+        q = queue.popleft()
+        for d in transitions.get(q, {}).values():
+            if d not in reachable:
+                reachable.add(d)
+                queue.append(d)
+
+    # Útiles: alcanzables que llegan a un estado de aceptación
+    reverse: Dict[str, Set[str]] = defaultdict(set)
+    for q in reachable:
+        for d in transitions.get(q, {}).values():
+            reverse[d].add(q)
+    alive = {q for q in reachable if q in accepting}
+    queue = deque(alive)
+    while queue:
+        q = queue.popleft()
+        for p in reverse[q]:
+            if p not in alive:
+                alive.add(p)
+                queue.append(p)
+
+    if start not in alive:
+        return {
+            "type": "AFD", "states": ["q0"], "alphabet": alphabet,
+            "start": "q0", "accepting": [], "transitions": {"q0": {}},
+        }
+
+    def delta(q: str, a: str) -> Optional[str]:
+        d = transitions.get(q, {}).get(a)
+        return d if d in alive else None
+
+    states = sorted(alive)
+    block = {q: int(q in accepting) for q in states}
+    n_blocks = len(set(block.values()))
+    while True:
+        signatures: Dict[Tuple, int] = {}
+        new_block: Dict[str, int] = {}
+        for q in states:
+            sig = (block[q],) + tuple(
+                block[d] if (d := delta(q, a)) is not None else -1 for a in alphabet
+            )
+            new_block[q] = signatures.setdefault(sig, len(signatures))
+        block = new_block
+        if len(signatures) == n_blocks:
+            break
+        n_blocks = len(signatures)
+
+    # Renombrar en orden BFS desde el inicial
+    names: Dict[int, str] = {block[start]: "q0"}
+    representative = {block[start]: start}
+    order = deque([start])
+    new_trans: Dict[str, Dict[str, str]] = {}
+    while order:
+        q = order.popleft()
+        row = {}
+        for a in alphabet:
+            d = delta(q, a)
+            if d is None:
+                continue
+            b = block[d]
+            if b not in names:
+                names[b] = f"q{len(names)}"
+                representative[b] = d
+                order.append(d)
+            row[a] = names[b]
+        new_trans[names[block[q]]] = row
+
+    return {
+        "type": "AFD",
+        "states": list(names.values()),
+        "alphabet": alphabet,
+        "start": "q0",
+        "accepting": [names[b] for b in names if representative[b] in accepting],
+        "transitions": new_trans,
+    }
+
+
+#AFD -> GRAMÁTICA / EXPRESIÓN REGULAR
+def dfa_to_grammar(automaton: Dict, max_states: Optional[int] = None) -> str:
+    """
+    AFD (o AFN) a gramática lineal derecha en el formato de texto de parse_grammar.
+    Se minimiza primero; los estados finales sin salidas no generan no terminal
+    (q --a--> f se escribe A -> a).
+    """
+    dfa = minimize_dfa(automaton_to_dfa(automaton, max_states=max_states))
+    transitions = dfa["transitions"]
+    accepting = set(dfa["accepting"])
+    if not accepting:
+        return "# Lenguaje vacío: el autómata no acepta ninguna cadena"
+
+    start = dfa["start"]
+    sinks = {q for q in accepting if not transitions.get(q) and q != start}
+    others = [q for q in dfa["states"] if q != start and q not in sinks]
+    if len(others) > len(_NT_NAMES):
+        raise ValueError(
+            f"El AFD mínimo tiene {len(others) + 1} estados con no terminal y solo hay "
+            f"{len(_NT_NAMES) + 1} letras (A-Z) para nombrarlos; la gramática no se puede escribir."
+        )
+    names = {start: "S"}
+    names.update(zip(others, _NT_NAMES))
+
+    lines = []
+    for q in dfa["states"]:
+        if q in sinks:
+            continue
+        alternatives = []
+        for a, d in transitions.get(q, {}).items():
+            alternatives.append(a if d in sinks else a + names[d])
+        if q in accepting:
+            alternatives.append(EPSILON)
+        if alternatives:
+            lines.append(f"{names[q]} -> " + " | ".join(alternatives))
+    return "\n".join(lines)
+
+
+def dfa_to_regex(
+    automaton: Dict, max_states: Optional[int] = None, max_size: Optional[int] = MAX_REGEX_SIZE
+) -> str:
+    """
+    AFD (o AFN) a expresión regular por eliminación de estados.
+
+    Tras minimizar, se añade un inicio y un final nuevos y se eliminan los
+    estados de uno en uno, eligiendo siempre el de menor (entradas × salidas):
+    así se crean menos aristas nuevas y la expresión crece menos.
+    Aun así puede crecer exponencialmente: si alguna subexpresión supera
+    max_size se lanza ValueError antes de construir la cadena.
+    """
+    dfa = minimize_dfa(automaton_to_dfa(automaton, max_states=max_states))
+    rb = RegexBuilder()
+    for a in dfa["alphabet"]:
+        rb.sym(a)
+
+    START, FINAL = object(), object()
+    out: Dict[object, Dict[object, int]] = defaultdict(dict)
+    inn: Dict[object, Dict[object, int]] = defaultdict(dict)
+
+    def add(p, q, r: int) -> None:
+        current = out[p].get(q, rb.EMPTY)
+        merged = rb.alt(current, r)
+        if merged == rb.EMPTY:
+            return
+        if max_size is not None and rb.size[merged] > max_size:
+            raise ValueError(
+                f"La expresión regular resultante es demasiado grande (más de {max_size} símbolos)."
+            )
+        out[p][q] = merged
+        inn[q][p] = merged
+
+    add(START, dfa["start"], rb.EPS)
+    for q in dfa["accepting"]:
+        add(q, FINAL, rb.EPS)
+    for q, row in dfa["transitions"].items():
+        for a, d in row.items():
+            add(q, d, rb.sym(a))
+
+    remaining = set(dfa["states"])
+    while remaining:
+        def cost(k) -> Tuple[int, int]:
+            ins = len(inn[k]) - (k in inn[k])
+            outs = len(out[k]) - (k in out[k])
+            return ins * outs, ins + outs
+        k = min(remaining, key=lambda s: (cost(s), s))
+        remaining.discard(k)
+
+        loop = rb.star(out[k].pop(k, rb.EMPTY))
+        inn[k].pop(k, None)
+        preds = list(inn.pop(k).items())
+        succs = list(out.pop(k).items())
+        for p, _ in preds:
+            del out[p][k]
+        for q, _ in succs:
+            del inn[q][k]
+        for p, r_in in preds:
+            for q, r_out in succs:
+                add(p, q, rb.cat(r_in, loop, r_out))
+
+    return rb.to_string(out[START].get(FINAL, rb.EMPTY))
+
+
+def regex_to_dfa(text: str, max_states: Optional[int] = None) -> Dict:
+    """
+    Expresión regular -> AFN (Thompson) -> AFD mínimo.
+    Con max_states se lanza ValueError si la determinización crece más de la cuenta.
+    """
+    return minimize_dfa(nfa_to_dfa(regex_to_nfa(text), max_states=max_states))
@@ -0,0 +1,437 @@
+from typing import Dict, List, Optional, Set, Tuple
+from collections import defaultdict
+from functools import lru_cache
+import heapq
+import math
+
+Production = Tuple[str, str]
+
+
+def is_context_free(grammar: Dict) -> bool:
+    return all(len(left) == 1 and left.isupper() for left, _ in grammar["productions"])
+
+
+def _nonterminals_in(rhs: str) -> List[str]:
+    return [ch for ch in rhs if ch.isupper()]
+
+
+#SÍMBOLOS PRODUCTIVOS, ALCANZABLES Y ÚTILES
+def productive_nonterminals(productions: List[Production]) -> Set[str]:
+    """
+    No terminales que derivan alguna cadena de terminales.
+    Punto fijo con contadores: cada producción espera a que sus no terminales
+    sean productivos, así que el coste es lineal en el tamaño de la gramática.
+    """
+    waiting: List[int] = []
+    uses: Dict[str, List[int]] = defaultdict(list)
+    productive: Set[str] = set()
+    queue: List[str] = []
+
+    for i, (left, rhs) in enumerate(productions):
+        pending = set(_nonterminals_in(rhs))
+        waiting.append(len(pending))
+        for B in pending:
+            uses[B].append(i)
+        if not pending and left not in productive:
+            productive.add(left)
+            queue.append(left)
+
+    while queue:
+        B = queue.pop()
+        for i in uses[B]:
+            waiting[i] -= 1
+            left = productions[i][0]
+            if waiting[i] == 0 and left not in productive:
+                productive.add(left)
+                queue.append(left)
+    return productive
+
+
+def _productive_rules(productions: List[Production], productive: Set[str]) -> Dict[str, List[str]]:
+    rules: Dict[str, List[str]] = defaultdict(list)
+    for left, rhs in productions:
+        if left in productive and all(B in productive for B in _nonterminals_in(rhs)):
+            if rhs not in rules[left]:
+                rules[left].append(rhs)
+    return rules
+
+
+def _reachable(start: str, rules: Dict[str, List[str]]) -> Set[str]:
+    seen = {start} if start in rules else set()
+    stack = list(seen)
+    while stack:
+        A = stack.pop()
+        for rhs in rules[A]:
+            for B in _nonterminals_in(rhs):
+                if B not in seen:
+                    seen.add(B)
+                    stack.append(B)
+    return seen
+
+
+def _nonempty_capable(rules: Dict[str, List[str]]) -> Set[str]:
+    """
+    No terminales que derivan alguna cadena NO vacía.
+    Basta un terminal o un no terminal capaz en alguna alternativa (el resto son
+    productivos), así que se propaga hacia atrás con una lista de trabajo: lineal.
+    """
+    users: Dict[str, Set[str]] = defaultdict(set)
+    capable: Set[str] = set()
+    queue: List[str] = []
+    for A, alternatives in rules.items():
+        for rhs in alternatives:
+            for ch in rhs:
+                if ch.isupper():
+                    users[ch].add(A)
+                elif A not in capable:
+                    capable.add(A)
+                    queue.append(A)
+
+    while queue:
+        B = queue.pop()
+        for A in users[B]:
+            if A not in capable:
+                capable.add(A)
+                queue.append(A)
+    return capable
+
+
+def _strongly_connected(nodes: List[str], edges: Dict[str, List[str]]) -> Dict[str, int]:
+    """
+    Tarjan iterativo. Las componentes se numeran en orden topológico inverso
+    (primero las que no dependen de nadie).
+    """
+    index: Dict[str, int] = {}
+    low: Dict[str, int] = {}
+    component: Dict[str, int] = {}
+    stack: List[str] = []
+    on_stack: Set[str] = set()
+    counter = 0
+    n_components = 0
+
+    for root in nodes:
+        if root in index:
+            continue
+        work = [(root, iter(edges.get(root, [])))]
+        index[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack.add(root)
+        while work:
+            v, children = work[-1]
+            advanced = False
+            for w in children:
+                if w not in index:
+                    index[w] = low[w] = counter
+                    counter += 1
+                    stack.append(w)
+                    on_stack.add(w)
+                    work.append((w, iter(edges.get(w, []))))
+                    advanced = True
+                    break
+                if w in on_stack:
+                    low[v] = min(low[v], index[w])
+            if advanced:
+                continue
+            work.pop()
+            if work:
+                low[work[-1][0]] = min(low[work[-1][0]], low[v])
+            if low[v] == index[v]:
+                while True:
+                    w = stack.pop()
+                    on_stack.discard(w)
+                    component[w] = n_components
+                    if w == v:
+                        break
+                n_components += 1
+    return component
+
+
+#TABLAS DE RENDIMIENTO MÍNIMO
+def yield_tables(grammar: Dict) -> Optional[Dict]:
+    """
+    Tablas por no terminal de una gramática libre de contexto:
+
+      - "min_yield": longitud de la cadena terminal más corta que deriva
+        (math.inf si no es productivo).
+      - "shortest": esa cadena más corta.
+      - "choice": la producción usada para obtenerla (sirve para reconstruir
+        la derivación con shortest_derivation).
+      - "first": terminales con los que puede empezar una cadena no vacía.
+
+    Se calculan una sola vez por gramática y se guardan en caché.
+    Devuelve None si la gramática no es libre de contexto.
+    """
+    if not is_context_free(grammar):
+        return None
+    return _cached_yield_tables(tuple(sorted(set(grammar["productions"]))))
+
+
+@lru_cache(maxsize=1024)
+def _cached_yield_tables(productions: Tuple[Production, ...]) -> Dict:
+    # Generalización de Dijkstra (Knuth): un no terminal se fija cuando sale del
+    # montículo con su menor valor; una producción se evalúa cuando todos sus
+    # no terminales están fijados, así las elecciones nunca forman ciclos.
+    waiting: List[int] = []
+    uses: Dict[str, List[int]] = defaultdict(list)
+    heap: List[Tuple[int, int]] = []
+    for i, (left, rhs) in enumerate(productions):
+        pending = set(_nonterminals_in(rhs))
+        waiting.append(len(pending))
+        for B in pending:
+            uses[B].append(i)
+        if not pending:
+            heapq.heappush(heap, (len(rhs), i))
+
+    min_yield: Dict[str, float] = {}
+    choice: Dict[str, str] = {}
+    while heap:
+        value, i = heapq.heappop(heap)
+        left, rhs = productions[i]
+        if left in min_yield:
+            continue
+        min_yield[left] = value
+        choice[left] = rhs
+        for j in uses[left]:
+            waiting[j] -= 1
+            if waiting[j] == 0:
+                l2, r2 = productions[j]
+                if l2 not in min_yield:
+                    total = sum(min_yield[ch] if ch.isupper() else 1 for ch in r2)
+                    heapq.heappush(heap, (total, j))
+
+    shortest: Dict[str, str] = {}
+    for A in min_yield:
+        _build_shortest(A, choice, shortest)
+
+    rules = _productive_rules(list(productions), set(min_yield))
+    nullable = {A for A, v in min_yield.items() if v == 0}
+    first: Dict[str, Set[str]] = {A: set() for A in min_yield}
+    changed = True
+    while changed:
+        changed = False
+        for A, alternatives in rules.items():
+            before = len(first[A])
+            for rhs in alternatives:
+                for ch in rhs:
+                    if not ch.isupper():
+                        first[A].add(ch)
+                        break
+                    first[A] |= first[ch]
+                    if ch not in nullable:
+                        break
+            if len(first[A]) != before:
+                changed = True
+
+    for left, rhs in productions:
+        for A in [left] + _nonterminals_in(rhs):
+            min_yield.setdefault(A, math.inf)
+    return {
+        "min_yield": min_yield,
+        "shortest": shortest,
+        "choice": choice,
+        "first": {A: frozenset(f) for A, f in first.items()},
+    }
+
+
+def _build_shortest(A: str, choice: Dict[str, str], memo: Dict[str, str]) -> str:
+    stack = [A]
+    while stack:
+        B = stack[-1]
+        if B in memo:
+            stack.pop()
+            continue
+        missing = [ch for ch in choice[B] if ch.isupper() and ch not in memo]
+        if missing:
+            stack.extend(missing)
+            continue
+        memo[B] = "".join(memo[ch] if ch.isupper() else ch for ch in choice[B])
+        stack.pop()
+    return memo[A]
+
+
+def shortest_derivation(grammar: Dict, symbol: Optional[str] = None) -> List[str]:
+    """
+    Derivación más a la izquierda de la cadena terminal más corta desde symbol
+    (por defecto, el inicial). Lista vacía si symbol no es productivo.
+    """
+    tables = yield_tables(grammar)
+    symbol = symbol or grammar["start"]
+    if tables is None or symbol not in tables["choice"]:
+        return []
+    form = symbol
+    steps = [form]
+    while True:
+        idx = next((i for i, ch in enumerate(form) if ch.isupper()), None)
+        if idx is None:
+            return steps
+        form = form[:idx] + tables["choice"][form[idx]] + form[idx + 1:]
+        steps.append(form)
+
+
+#CONTEO EXACTO (GRAMÁTICAS REGULARES)
+def _count_regular(grammar: Dict, max_states: int) -> Optional[Dict[int, int]]:
+    """
+    Cadenas por longitud de un lenguaje regular finito: se construye el AFD
+    mínimo (acíclico al ser finito) y se cuentan sus caminos, sin enumerarlos.
+    """
+    from converters import grammar_to_nfa, nfa_to_dfa, minimize_dfa
+
+    try:
+        dfa = minimize_dfa(nfa_to_dfa(grammar_to_nfa(grammar), max_states=max_states))
+    except ValueError:
+        return None
+    transitions = dfa["transitions"]
+    accepting = set(dfa["accepting"])
+    memo: Dict[str, Dict[int, int]] = {}
+
+    order: List[str] = []
+    seen: Set[str] = set()
+    stack = [(dfa["start"], False)]
+    while stack:
+        q, expanded = stack.pop()
+        if expanded:
+            order.append(q)
+            continue
+        if q in seen:
+            continue
+        seen.add(q)
+        stack.append((q, True))
+        for d in transitions.get(q, {}).values():
+            if d not in seen:
+                stack.append((d, False))
+
+    for q in order:  # postorden: los sucesores ya están calculados
+        counts: Dict[int, int] = defaultdict(int)
+        if q in accepting:
+            counts[0] += 1
+        for d in transitions.get(q, {}).values():
+            for n, c in memo[d].items():
+                counts[n + 1] += c
+        memo[q] = dict(counts)
+    return memo[dfa["start"]]
+
+
+#RESUMEN DEL LENGUAJE
+def language_summary(grammar: Dict, max_states: int = 2000) -> Optional[Dict]:
+    """
+    Análisis de una gramática libre de contexto sobre su grafo de dependencias:
+
+      - "empty": el símbolo inicial no es productivo (punto fijo lineal).
+      - "finite": no hay ciclo entre no terminales útiles que haga crecer la
+        cadena (A =>+ αAβ con αβ no vacío), detectado con componentes fuertemente conexas.
+      - "contains_epsilon": ε pertenece al lenguaje.
+      - "max_length": longitud de la cadena más larga (solo si es finito).
+      - "size_by_length" / "size": número EXACTO de cadenas por longitud y total,
+        calculado por programación dinámica sobre el AFD; solo para gramáticas
+        regulares finitas (None en otro caso).
+      - "max_steps": máximo de pasos de derivación (si el grafo es acíclico).
+
+    Devuelve None si la gramática no es libre de contexto.
+    """
+    if not is_context_free(grammar):
+        return None
+    key = (grammar["start"], tuple(sorted(set(grammar["productions"]))), max_states)
+    return dict(_cached_summary(key))
+
+
+@lru_cache(maxsize=1024)
+def _cached_summary(key: Tuple) -> Dict:
+    start, productions, max_states = key
+    productions = list(productions)
+    productive = productive_nonterminals(productions)
+    summary = {
+        "empty": start not in productive,
+        "finite": True,
+        "contains_epsilon": False,
+        "max_length": None,
+        "size_by_length": None,
+        "size": None,
+        "max_steps": None,
+    }
+    if summary["empty"]:
+        summary["size_by_length"] = {}
+        summary["size"] = 0
+        return summary
+
+    rules = _productive_rules(productions, productive)
+    useful = _reachable(start, rules)
+    capable = _nonempty_capable(rules)
+    nodes = sorted(useful)
+
+    # Aristas A -> B; "crece" si el resto del lado derecho puede aportar terminales
+    edges: Dict[str, List[str]] = defaultdict(list)
+    growing: List[Tuple[str, str]] = []
+    for A in nodes:
+        for rhs in rules[A]:
+            for i, B in enumerate(rhs):
+                if not B.isupper():
+                    continue
+                edges[A].append(B)
+                others = rhs[:i] + rhs[i + 1:]
+                if any(not ch.isupper() or ch in capable for ch in others):
+                    growing.append((A, B))
+
+    component = _strongly_connected(nodes, edges)
+    summary["finite"] = not any(component[A] == component[B] for A, B in growing)
+
+    # ε ∈ L: los anulables son los "productivos" de las reglas sin terminales,
+    # así que sirve el mismo punto fijo con contadores (lineal)
+    nullable = productive_nonterminals([
+        (A, rhs) for A in nodes for rhs in rules[A] if all(ch.isupper() for ch in rhs)
+    ])
+    summary["contains_epsilon"] = start in nullable
+
+    if not summary["finite"]:
+        return summary
+
+    # Longitud máxima: por componentes en orden topológico inverso; dentro de una
+    # componente (ciclos que no crecen) se itera hasta estabilizar.
+    by_component: Dict[int, List[str]] = defaultdict(list)
+    for A in nodes:
+        by_component[component[A]].append(A)
+    longest: Dict[str, int] = {}
+    for c in sorted(by_component):
+        members = by_component[c]
+        for A in members:
+            longest[A] = -1
+        changed = True
+        while changed:
+            changed = False
+            for A in members:
+                for rhs in rules[A]:
+                    value = sum(1 if not ch.isupper() else longest[ch] for ch in rhs)
+                    if all(not ch.isupper() or longest[ch] >= 0 for ch in rhs) and value > longest[A]:
+                        longest[A] = value
+                        changed = True
+    summary["max_length"] = longest[start]
+
+    acyclic = len(set(component.values())) == len(nodes) and not any(A in edges[A] for A in nodes)
+    if acyclic:
+        steps: Dict[str, int] = {}
+        for c in sorted(by_component):
+            A = by_component[c][0]
+            steps[A] = max(1 + sum(steps[ch] for ch in rhs if ch.isupper()) for rhs in rules[A])
+        summary["max_steps"] = steps[start]
+
+    grammar = {"start": start, "productions": productions, "nonterminals": sorted({l for l, _ in productions})}
+    from classifier import classify_grammar
+
+    if classify_grammar(grammar)[0] == 3:
+        by_length = _count_regular(grammar, max_states)
+        if by_length is not None:
+            summary["size_by_length"] = dict(sorted(by_length.items()))
+            summary["size"] = sum(by_length.values())
+    return summary
+
+
+def is_empty(grammar: Dict) -> bool:
+    return grammar["start"] not in productive_nonterminals(grammar["productions"])
+
+
+def is_finite(grammar: Dict) -> Optional[bool]:
+    """
+    True/False si el lenguaje es finito; None si la gramática no es libre de contexto.
+    """
+    summary = language_summary(grammar)
+    return None if summary is None else summary["finite"]
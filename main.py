@@ -3,13 +3,14 @@ from grammar_parser import parse_grammar, parse_automaton_json
 from classifier import (
     classify_grammar,
     classify_automaton_kind,
-    compare_grammars,
     TYPE_LABELS,
 )
-from visualizer import grammar_to_graphviz, automaton_to_graphviz
-from utils_examples import get_example_grammar_text, pretty_print_classification
-from report_generator import generate_pdf_report
+from utils_examples import get_example_grammar_text, pretty_print_classification, describe_language
 import os
+import time
+
+# Streamlit vuelve a ejecutar este script en cada interacción: los módulos pesados
+# (graphviz, reportlab, networkx) y los análisis se importan solo en el modo que los usa.
 
 st.set_page_config(
     page_title="Chomsky Classifier AI",
@@ -22,7 +23,7 @@ mode = st.sidebar.radio(
     [
         "1. Clasificar Gramática",
         "2. Clasificar Autómata",
-        "3. Conversores Regex ⇄ AFD ⇄ Gramática Regular (demo)",
+        "3. Conversores Regex ⇄ AFD ⇄ Gramática Regular",
         "4. Generador de Ejemplos",
         "5. Modo Tutor / Quiz",
         "6. Comparar dos Gramáticas",
@@ -33,6 +34,11 @@ mode = st.sidebar.radio(
 
 #Clasificar Gramatica
 if mode == "1. Clasificar Gramática":
+    from visualizer import grammar_to_graphviz
+    from ambiguity import find_ambiguity
+    from membership import check_membership
+    from grammar_analysis import language_summary
+
     st.header("Clasificar Gramática (Jerarquía de Chomsky)")
 
     st.markdown(
@@ -42,6 +48,10 @@ if mode == "1. Clasificar Gramática":
 
     default_grammar = """S -> aSb | ab"""
     grammar_text = st.text_area("Gramática:", value=default_grammar, height=200)
+    ambiguity_len = st.slider(
+        "Longitud máxima para el análisis de ambigüedad (Tipo 2/3)", min_value=1, max_value=10, value=6
+    )
+    membership_word = st.text_input("Cadena a comprobar (gramáticas Tipo 1, opcional):", value="")
 
     if st.button("Clasificar gramática"):
         try:
@@ -52,6 +62,28 @@ if mode == "1. Clasificar Gramática":
             for e in expl:
                 st.markdown(f"- {e}")
 
+            if type_id in (2, 3):
+                st.markdown(f"**Lenguaje:** {describe_language(language_summary(grammar))}")
+
+            if type_id == 1 and membership_word.strip():
+                st.subheader("Pertenencia de la cadena")
+                word = membership_word.strip()
+                res = check_membership(grammar, word, timeout=5.0)
+                if res["member"] is None:
+                    motivo = {
+                        "timeout": "se agotó el tiempo",
+                        "max_nodes": "se agotó el presupuesto de nodos",
+                        "erasable_start": "S -> ε con S en un lado derecho impide descartarla",
+                    }.get(res["reason"], res["reason"])
+                    st.warning(
+                        f"No se pudo decidir ({motivo}; {res['explored']} formas exploradas)."
+                    )
+                elif res["member"]:
+                    st.success(f"`{word}` pertenece al lenguaje. Derivación encontrada:")
+                    st.code(" ⇒ ".join(f or "ε" for f in res["derivation"]), language="text")
+                else:
+                    st.error(f"`{word}` NO pertenece al lenguaje ({res['explored']} formas exploradas).")
+
             st.subheader("Visualización (grafo de no terminales)")
             dot = grammar_to_graphviz(grammar)
             st.graphviz_chart(dot)
@@ -62,9 +94,45 @@ if mode == "1. Clasificar Gramática":
         except Exception as e:
             st.error(f"Error al analizar la gramática: {e}")
 
+    # La búsqueda de ambigüedad puede ser costosa: solo se lanza a petición y con presupuesto
+    if st.button("Analizar ambigüedad (Tipo 2/3)"):
+        try:
+            grammar = parse_grammar(grammar_text)
+            type_id, _ = classify_grammar(grammar)
+            if type_id not in (2, 3):
+                st.info("El análisis de ambigüedad solo aplica a gramáticas Tipo 2 o Tipo 3.")
+            else:
+                st.subheader("Análisis de ambigüedad")
+                amb = find_ambiguity(grammar, max_len=ambiguity_len, timeout=5.0)
+                if amb["ambiguous"]:
+                    st.warning(
+                        "La gramática es **ambigua**. Cadenas ambiguas más cortas: "
+                        + ", ".join(w or "ε" for w in amb["shortest"])
+                    )
+                    for ex in amb["examples"]:
+                        count = "∞" if ex["count"] == float("inf") else ex["count"]
+                        st.markdown(f"`{ex['string'] or 'ε'}` tiene {count} derivaciones más a la izquierda, por ejemplo:")
+                        st.code("\n".join(ex["trees"]), language="text")
+                elif amb["checked_len"] < 0:
+                    st.warning("No se pudo analizar ninguna longitud dentro del presupuesto de búsqueda.")
+                else:
+                    st.info(
+                        f"No se encontraron cadenas ambiguas: verificado hasta longitud {amb['checked_len']} "
+                        f"({amb['checked']} cadenas analizadas)."
+                    )
+                if not amb["complete"]:
+                    motivo = "tiempo agotado" if amb["reason"] == "timeout" else "demasiadas cadenas candidatas"
+                    st.caption(
+                        f"Búsqueda interrumpida antes de longitud {amb['max_len']} ({motivo})."
+                    )
+        except Exception as e:
+            st.error(f"Error al analizar la gramática: {e}")
+
 
 #Clasificar Automata
 elif mode == "2. Clasificar Autómata":
+    from visualizer import automaton_to_graphviz
+
     st.header("Clasificar Autómata (AFD, AP, MT)")
 
     st.markdown(
@@ -115,42 +183,123 @@ elif mode == "2. Clasificar Autómata":
 
 
 #Conversores Regex AFD Gramatica Regular
-elif mode == "3. Conversores Regex ⇄ AFD ⇄ Gramática Regular (demo)":
-    st.header("Conversores Regex ⇄ AFD ⇄ Gramática Regular (demo)")
+elif mode == "3. Conversores Regex ⇄ AFD ⇄ Gramática Regular":
+    from visualizer import grammar_to_graphviz, automaton_to_graphviz
+    from converters import (
+        regex_to_dfa,
+        grammar_to_nfa,
+        nfa_to_dfa,
+        minimize_dfa,
+        dfa_to_grammar,
+        dfa_to_regex,
+    )
+    import json
+
+    # Límite de estados del AFD: la construcción de subconjuntos puede ser exponencial
+    # (p. ej. (a|b)*a(a|b){14} necesita 32768 estados)
+    MAX_DFA_STATES = 500
+
+    st.header("Conversores Regex ⇄ AFD ⇄ Gramática Regular")
 
     st.markdown(
-        "En esta sección se demuestra, de forma **simplificada**, la conversión entre:\n"
-        "- Expresión regular → Gramática Regular\n"
-        "Para fines académicos se asume una expresión con alfabeto {a,b} y patron típico `(a|b)*abb`."
+        "Conversiones entre las tres representaciones de los lenguajes regulares:\n"
+        "- Expresión regular → AFN (Thompson) → AFD mínimo → Gramática Regular\n"
+        "- Gramática Regular → AFN → AFD (construcción de subconjuntos)\n"
+        "- AFD (JSON) → Gramática Regular y → Expresión regular (eliminación de estados)\n"
+        "Los resultados se minimizan y simplifican para que sean lo más compactos posible."
     )
 
-    regex = st.text_input("Expresión regular:", value="(a|b)*abb")
+    direction = st.radio(
+        "Conversión",
+        [
+            "Expresión regular → AFD → Gramática",
+            "Gramática Regular → AFN → AFD",
+            "AFD (JSON) → Gramática / Expresión regular",
+        ],
+    )
 
-    def regex_to_regular_grammar(regex_str: str) -> str:
-        """
-        Implementación DEMO: para (a|b)*abb devolvemos una gramática regular conocida.
-        En un proyecto más completo se implementaría Thompson + construcción formal.
-        """
-        if regex_str.strip() == "(a|b)*abb":
-            return """S -> aS | bS | aA
+    if direction == "Expresión regular → AFD → Gramática":
+        regex = st.text_input("Expresión regular:", value="(a|b)*abb")
+
+        if st.button("Convertir expresión regular"):
+            try:
+                dfa = regex_to_dfa(regex, max_states=MAX_DFA_STATES)
+                st.subheader("AFD mínimo:")
+                st.graphviz_chart(automaton_to_graphviz(dfa))
+                with st.expander("Ver AFD en JSON"):
+                    st.code(json.dumps(dfa, indent=2, ensure_ascii=False), language="json")
+
+                gram = dfa_to_grammar(dfa, max_states=MAX_DFA_STATES)
+                st.subheader("Gramática Regular:")
+                st.code(gram, language="text")
+                st.graphviz_chart(grammar_to_graphviz(parse_grammar(gram)))
+            except Exception as e:
+                st.error(f"Error en la conversión: {e}")
+
+    elif direction == "Gramática Regular → AFN → AFD":
+        grammar_text = st.text_area(
+            "Gramática Regular:",
+            value="""S -> aS | bS | aA
 A -> bB
 B -> bC
-C -> ε"""
-        else:
-            return f"""S -> aS | bS | {regex_str.replace('*','')}"""
+C -> ε""",
+            height=200,
+        )
 
-    if st.button("Convertir Regex a Gramática Regular"):
-        gram = regex_to_regular_grammar(regex)
-        st.subheader("Gramática Regular (demo):")
-        st.code(gram, language="text")
-        grammar = parse_grammar(gram)
-        dot = grammar_to_graphviz(grammar)
-        st.graphviz_chart(dot)
-        st.info("Conversor completo es un trabajo más extenso; aquí se muestra un ejemplo demostrativo.")
+        if st.button("Convertir gramática"):
+            try:
+                nfa = grammar_to_nfa(parse_grammar(grammar_text))
+                st.subheader("AFN:")
+                st.graphviz_chart(automaton_to_graphviz(nfa))
+
+                dfa = minimize_dfa(nfa_to_dfa(nfa, max_states=MAX_DFA_STATES))
+                st.subheader("AFD mínimo:")
+                st.graphviz_chart(automaton_to_graphviz(dfa))
+                st.code(json.dumps(dfa, indent=2, ensure_ascii=False), language="json")
+            except Exception as e:
+                st.error(f"Error en la conversión: {e}")
+
+    else:
+        default_automaton = """{
+  "type": "AFD",
+  "states": ["q0","q1","q2","q3"],
+  "alphabet": ["a","b"],
+  "start": "q0",
+  "accepting": ["q3"],
+  "transitions": {
+    "q0": {"a": "q1", "b": "q0"},
+    "q1": {"a": "q1", "b": "q2"},
+    "q2": {"a": "q1", "b": "q3"},
+    "q3": {"a": "q1", "b": "q0"}
+  }
+}"""
+        automaton_text = st.text_area("Autómata (JSON):", value=default_automaton, height=300)
+
+        if st.button("Convertir autómata"):
+            try:
+                automaton = parse_automaton_json(automaton_text)
+            except Exception as e:
+                st.error(f"Error en la conversión: {e}")
+            else:
+                # Cada conversión tiene sus propios límites: si una falla, la otra se muestra igual
+                st.subheader("Gramática Regular:")
+                try:
+                    st.code(dfa_to_grammar(automaton, max_states=MAX_DFA_STATES), language="text")
+                except Exception as e:
+                    st.error(f"Error en la conversión: {e}")
+
+                st.subheader("Expresión regular:")
+                try:
+                    st.code(dfa_to_regex(automaton, max_states=MAX_DFA_STATES), language="text")
+                except Exception as e:
+                    st.error(f"Error en la conversión: {e}")
 
 
 #Generador de Ejemplos 
 elif mode == "4. Generador de Ejemplos":
+    from visualizer import grammar_to_graphviz
+    from grammar_analysis import language_summary, yield_tables, shortest_derivation
+
     st.header("Generador Automático de Ejemplos de Gramáticas")
 
     type_choice = st.selectbox(
@@ -165,6 +314,18 @@ elif mode == "4. Generador de Ejemplos":
         st.code(txt, language="text")
 
         grammar = parse_grammar(txt)
+        st.markdown(f"**Lenguaje:** {describe_language(language_summary(grammar))}")
+        tables = yield_tables(grammar)
+        if tables is not None:
+            with st.expander("Cadenas más cortas por no terminal"):
+                nts = sorted(tables["shortest"])
+                st.table({
+                    "No terminal": nts,
+                    "Longitud mínima": [tables["min_yield"][A] for A in nts],
+                    "Cadena más corta": [tables["shortest"][A] or "ε" for A in nts],
+                    "Primeros terminales": [", ".join(sorted(tables["first"][A])) or "—" for A in nts],
+                })
+                st.code(" ⇒ ".join(f or "ε" for f in shortest_derivation(grammar)), language="text")
         dot = grammar_to_graphviz(grammar)
         st.subheader("Visualización:")
         st.graphviz_chart(dot)
@@ -174,21 +335,47 @@ elif mode == "4. Generador de Ejemplos":
 elif mode == "5. Modo Tutor / Quiz":
     st.header(" Modo Tutor de Chomsky (Quiz)")
 
-    st.markdown("Clasifica mentalmente la gramática y luego comprueba tu respuesta.")
+    st.markdown("Clasifica mentalmente la gramática o el autómata y luego comprueba tu respuesta.")
 
-    from classifier import get_quiz_question
-    if "quiz_grammar" not in st.session_state:
-        g, t = get_quiz_question()
-        st.session_state.quiz_grammar = g
-        st.session_state.quiz_answer = t
+    from question_bank import next_question, KINDS, DIFFICULTY_LABELS, ANY
 
-    if st.button("Nueva gramática"):
-        g, t = get_quiz_question()
-        st.session_state.quiz_grammar = g
-        st.session_state.quiz_answer = t
+    col1, col2 = st.columns(2)
+    with col1:
+        quiz_kind = st.selectbox(
+            "Tipo de pregunta",
+            options=[ANY, "g", "a"],
+            format_func=lambda k: "Gramáticas y autómatas" if k == ANY else KINDS[k],
+        )
+    with col2:
+        quiz_difficulty = st.selectbox(
+            "Dificultad",
+            options=[ANY, 1, 2, 3],
+            format_func=lambda d: "Cualquiera" if d == ANY else DIFFICULTY_LABELS[d],
+        )
+
+    # Preguntas ya servidas en esta sesión (por grupo), para no repetir
+    if "quiz_state" not in st.session_state:
+        st.session_state.quiz_state = {}
+
+    new_question = st.button("Nueva pregunta")
+    if new_question or "quiz_question" not in st.session_state:
+        st.session_state.quiz_question = next_question(
+            st.session_state.quiz_state, kind=quiz_kind, difficulty=quiz_difficulty
+        )
+
+    question = st.session_state.quiz_question
+    if question is None:
+        st.warning("No hay preguntas con esos filtros.")
+        st.stop()
 
-    st.subheader("Gramática a clasificar:")
-    st.code(st.session_state.quiz_grammar, language="text")
+    st.subheader(
+        f"{KINDS[question['kind']]} a clasificar "
+        f"(dificultad: {DIFFICULTY_LABELS[question['difficulty']].lower()}):"
+    )
+    if question["kind"] == "a":
+        st.json(question["text"])
+    else:
+        st.code(question["text"], language="text")
 
     user_choice = st.radio(
         "¿Qué tipo crees que es?",
@@ -196,7 +383,7 @@ elif mode == "5. Modo Tutor / Quiz":
     )
 
     if st.button("Comprobar respuesta"):
-        correct = st.session_state.quiz_answer
+        correct = question["answer"]
         if user_choice == correct:
             st.success(f"¡Correcto! La respuesta era: {correct}.")
         else:
@@ -230,21 +417,74 @@ A -> Sb | b""",
 
     max_len = st.slider("Longitud máxima de cadenas", min_value=1, max_value=8, value=5)
     max_steps = st.slider("Profundidad de derivación (pasos)", min_value=2, max_value=10, value=6)
+    time_limit = st.slider("Tiempo máximo de cálculo (segundos)", min_value=1, max_value=30, value=10)
 
     if st.button("Comparar gramáticas"):
         from grammar_parser import parse_grammar
         from classifier import compare_grammars
+        from background import run_in_background
 
         try:
             g1 = parse_grammar(g1_text)
             g2 = parse_grammar(g2_text)
-            result = compare_grammars(g1, g2, max_len=max_len, max_steps=max_steps)
+            previous = st.session_state.get("compare_task")
+            if previous is not None:
+                previous.cancel()
+            # El cálculo corre en un hilo aparte: la sesión puede cancelarlo y ver el progreso
+            st.session_state.compare_task = run_in_background(
+                compare_grammars, g1, g2, max_len=max_len, max_steps=max_steps, timeout=time_limit
+            )
+            st.session_state.compare_time_limit = time_limit
+        except Exception as e:
+            st.error(f"Error al comparar gramáticas: {e}")
 
-            if result["equivalent"]:
+    partial_reasons = {
+        "timeout": "se alcanzó el tiempo máximo",
+        "cancelled": "se canceló el cálculo",
+        "budget": "se agotó el presupuesto de expansiones",
+    }
+
+    # Cada sección solo muestra una instantánea de su cálculo; al final del modo se
+    # vuelve a ejecutar el script mientras quede alguno en marcha (ninguno bloquea al otro).
+    task = st.session_state.get("compare_task")
+    if task is not None and not task.done():
+        if st.button("Cancelar comparación"):
+            task.cancel()
+        limit = st.session_state.get("compare_time_limit", time_limit)
+        st.progress(min(task.elapsed() / limit, 1.0))
+        info = task.progress()
+        if info:
+            st.info(
+                f"Generando Gramática {info.get('grammar', 1)}: {info['expansions']} formas expandidas, "
+                f"{info['found']} cadenas encontradas..."
+            )
+            found = sorted(info["strings"], key=lambda w: (len(w), w))
+            st.code(", ".join(found[:50]) or "(ninguna todavía)", language="text")
+    elif task is not None:
+        try:
+            result = task.result()
+
+            if result["partial"]:
+                reason = partial_reasons.get(result["reason"], result["reason"])
+                st.warning(f"Resultado **parcial** ({reason}): solo se muestran las cadenas encontradas hasta entonces.")
+                if result["equivalent"]:
+                    st.info(
+                        "No se puede afirmar que las gramáticas sean equivalentes: "
+                        "las cadenas encontradas coinciden, pero la exploración no terminó."
+                    )
+                else:
+                    st.info(
+                        "Hay diferencias entre las cadenas encontradas, pero como la exploración no terminó "
+                        "pueden deberse a cadenas que aún no se habían generado."
+                    )
+            elif result["equivalent"]:
                 st.success("Las gramáticas parecen **equivalentes** para las cadenas generadas (hasta la longitud dada).")
             else:
                 st.warning("Las gramáticas NO parecen equivalentes (según la exploración limitada).")
 
+            st.markdown(f"**Gramática 1:** {describe_language(result['analysis1'])}")
+            st.markdown(f"**Gramática 2:** {describe_language(result['analysis2'])}")
+
             st.write("Cadenas en común:")
             st.code(", ".join(result["common"]) or "(ninguna)", language="text")
 
@@ -257,9 +497,102 @@ A -> Sb | b""",
         except Exception as e:
             st.error(f"Error al comparar gramáticas: {e}")
 
+    st.subheader("Comparar varias gramáticas (lote)")
+    st.markdown(
+        "Pega varias gramáticas separadas por una línea con `---`. "
+        "La primera se toma como **referencia**; el lenguaje acotado de cada gramática se genera una sola vez "
+        "y las gramáticas con el mismo lenguaje se agrupan en clases."
+    )
+    batch_text = st.text_area(
+        "Gramáticas:",
+        value="""S -> aSb | ab
+---
+S -> aA
+A -> Sb | b
+---
+S -> aS | bS | a | b""",
+        height=250,
+    )
+
+    if st.button("Comparar lote"):
+        from classifier import compare_many_grammars
+        from background import run_in_background
+
+        try:
+            blocks = [b for b in batch_text.split("---") if b.strip()]
+            grammars = [parse_grammar(b) for b in blocks]
+            if not grammars:
+                st.warning("Pega al menos una gramática para comparar el lote.")
+            else:
+                previous = st.session_state.get("batch_task")
+                if previous is not None:
+                    previous.cancel()
+                st.session_state.batch_task = run_in_background(
+                    compare_many_grammars, grammars, max_len=max_len, max_steps=max_steps, timeout=time_limit
+                )
+                st.session_state.batch_size = len(grammars)
+        except Exception as e:
+            st.error(f"Error al comparar el lote de gramáticas: {e}")
+
+    batch_task = st.session_state.get("batch_task")
+    if batch_task is not None and not batch_task.done():
+        if st.button("Cancelar lote"):
+            batch_task.cancel()
+        info = batch_task.progress()
+        if info and info["total"]:
+            st.progress(info["done"] / info["total"])
+            st.info(f"Lenguajes generados: {info['done']} de {info['total']}...")
+        else:
+            st.info("Preparando la comparación del lote...")
+    elif batch_task is not None:
+        try:
+            result = batch_task.result()
+            n_grammars = st.session_state.get("batch_size", len(result["cluster_of"]))
+
+            clusters = result["clusters"]
+            reference = result["cluster_of"][0]
+            if result["partial"]:
+                reason = partial_reasons.get(result["reason"], result["reason"])
+                st.warning(
+                    f"Resultado **parcial** ({reason}): el lenguaje de "
+                    + ", ".join(f"G{i + 1}" for i in result["incomplete"])
+                    + " no se generó completo, así que las clases no son fiables."
+                )
+            else:
+                st.success(
+                    f"{n_grammars} gramáticas en {len(clusters)} clase(s). "
+                    f"{len(clusters[reference]['members'])} coinciden con la referencia "
+                    f"(hasta longitud {result['max_len']})."
+                )
+
+            st.write("Clases de equivalencia (aproximada):")
+            st.table({
+                "Clase": [f"C{i + 1}" for i in range(len(clusters))],
+                "Gramáticas": [", ".join(f"G{m + 1}" for m in c["members"]) for c in clusters],
+                "Cadenas": [c["size"] for c in clusters],
+                "Huella": [c["fingerprint"] for c in clusters],
+            })
+
+            st.write("Diferencias entre clases (|L_i Δ L_j|):")
+            labels = [f"C{i + 1}" for i in range(len(clusters))]
+            st.table({"": labels, **{lab: col for lab, col in zip(labels, zip(*result["cluster_matrix"]))}})
+
+            with st.expander("Matriz completa entre gramáticas"):
+                labels = [f"G{i + 1}" for i in range(n_grammars)]
+                st.dataframe({"": labels, **{lab: col for lab, col in zip(labels, zip(*result["matrix"]))}})
+
+        except Exception as e:
+            st.error(f"Error al comparar el lote de gramáticas: {e}")
+
+    if any(t is not None and not t.done() for t in (task, batch_task)):
+        time.sleep(0.3)
+        st.rerun()
+
 
 # ====== 7. Generar Reporte PDF ======
 elif mode == "7. Generar Reporte PDF":
+    from report_generator import generate_pdf_report
+
     st.header("Generación de Reportes PDF")
 
     st.markdown(
@@ -0,0 +1,177 @@
+from typing import Dict, List, Optional, Tuple
+from collections import Counter
+import heapq
+import time
+
+Production = Tuple[str, str]
+
+# Cada cuántos nodos se consulta el reloj (time.monotonic() no es gratis)
+_CHECK_EVERY = 256
+
+
+def is_noncontracting(grammar: Dict) -> bool:
+    """
+    Gramática no contractiva: |α| <= |β| en toda producción α -> β,
+    salvo S -> ε como caso especial (misma condición que el Tipo 1 en classifier.py).
+    """
+    start = grammar["start"]
+    for left, rhs in grammar["productions"]:
+        if left == start and rhs == "":
+            continue
+        if len(rhs) < len(left):
+            return False
+    return True
+
+
+def _successors(form: str, rules: List[Production]):
+    """
+    Todas las formas que resultan de reescribir una ocurrencia de `src` por `dst`.
+    """
+    for src, dst in rules:
+        pos = form.find(src)
+        while pos != -1:
+            yield form[:pos] + dst + form[pos + len(src):]
+            pos = form.find(src, pos + 1)
+
+
+def _frozen_limits(rules: List[Production], origin: str, target: str) -> Dict[str, int]:
+    """
+    Símbolos cuya cantidad ninguna regla hace disminuir (en toda regla aparecen
+    en dst al menos tantas veces como en src): como nunca bajan durante la
+    búsqueda, no pueden superar la cantidad que tiene la forma objetivo.
+    """
+    symbols = {ch for src, dst in rules for ch in src + dst} | set(origin)
+    counts = Counter(target)
+    return {
+        ch: counts.get(ch, 0)
+        for ch in symbols
+        if all(dst.count(ch) >= src.count(ch) for src, dst in rules)
+    }
+
+
+def check_membership(
+    grammar: Dict,
+    word: str,
+    direction: str = "forward",
+    max_nodes: int = 200000,
+    timeout: Optional[float] = None,
+) -> Dict:
+    """
+    Decide si word pertenece al lenguaje de una gramática no contractiva (Tipo 1).
+
+    Como ninguna producción acorta la forma sentencial, basta explorar formas de
+    longitud <= |word|, que son finitas:
+      - "forward": derivaciones α -> β desde S descartando formas más largas que word (por defecto).
+      - "reverse": reducciones β -> α partiendo de word hasta llegar a S.
+    Se usa un conjunto de formas visitadas, poda por conteo de símbolos que nunca
+    disminuyen, un límite de nodos (max_nodes) y un plazo opcional (timeout, segundos).
+    Las cadenas con algún símbolo que ninguna regla produce se descartan sin buscar.
+
+    Si S -> ε convive con S en algún lado derecho, la búsqueda solo es forward y
+    con una cota de longitud relajada: sin derivación se devuelve None, no False.
+
+    Devuelve "member" = True/False, o None si no se pudo decidir; en ese caso
+    "reason" dice por qué ("max_nodes", "timeout" o "erasable_start").
+    """
+    if not is_noncontracting(grammar):
+        raise ValueError(
+            "La búsqueda de pertenencia solo aplica a gramáticas no contractivas (|α| ≤ |β|)."
+        )
+    if direction not in ("reverse", "forward"):
+        raise ValueError(f"Dirección de búsqueda desconocida: {direction}")
+
+    start = grammar["start"]
+    result = {"member": False, "derivation": [], "explored": 0, "direction": direction, "reason": None}
+    deadline = None if timeout is None else time.monotonic() + timeout
+
+    produced = {ch for _, r in grammar["productions"] for ch in r}
+    if any(ch not in produced for ch in word):
+        return result
+
+    if word == "":
+        # Ninguna otra regla acorta la forma: solo S -> ε deriva la cadena vacía
+        result["member"] = (start, "") in grammar["productions"]
+        if result["member"]:
+            result["derivation"] = [start, ""]
+        return result
+
+    # Si S -> ε existe y S aparece en algún lado derecho, S puede borrarse en mitad
+    # de una derivación y las formas intermedias pueden ser más largas que word.
+    erasable_start = (start, "") in grammar["productions"] and any(
+        start in r for _, r in grammar["productions"]
+    )
+    if erasable_start:
+        if direction == "reverse":
+            raise ValueError(
+                "La búsqueda inversa no admite S -> ε con S en un lado derecho; usa la dirección forward."
+            )
+        productions = list(grammar["productions"])
+    else:
+        # S -> ε solo sirve para derivar la cadena vacía
+        productions = [(l, r) for l, r in grammar["productions"] if r != ""]
+
+    if direction == "reverse":
+        rules = [(r, l) for l, r in productions]
+        origin, target = word, start
+        priority = len  # las formas más reducidas primero
+    else:
+        rules = productions
+        origin, target = start, word
+        priority = lambda f: abs(len(word) - len(f))  # las formas más cercanas a |w| primero
+
+    limits = _frozen_limits(rules, origin, target)
+    max_len = len(word)
+    if erasable_start:
+        # Se admiten hasta |w| + 1 símbolos S por borrar (uno entre cada par de
+        # símbolos); es una cota heurística, así que sin derivación no se afirma que no pertenezca.
+        max_len = 2 * len(word) + 1
+
+    parent: Dict[str, Optional[str]] = {origin: None}
+    heap = [(priority(origin), 0, origin)]
+    tie = 1
+    found = origin == target
+
+    while heap and not found:
+        if result["explored"] >= max_nodes:
+            result["member"], result["reason"] = None, "max_nodes"
+            return result
+        if (
+            deadline is not None
+            and result["explored"] % _CHECK_EVERY == 0
+            and time.monotonic() > deadline
+        ):
+            result["member"], result["reason"] = None, "timeout"
+            return result
+        _, _, form = heapq.heappop(heap)
+        result["explored"] += 1
+
+        for nxt in _successors(form, rules):
+            if nxt in parent or len(nxt) > max_len:
+                continue
+            if erasable_start and len(nxt) - nxt.count(start) > len(word):
+                continue
+            if limits:
+                counts = Counter(nxt)
+                if any(counts[ch] > limit for ch, limit in limits.items()):
+                    continue
+            parent[nxt] = form
+            if nxt == target:
+                found = True
+                break
+            heapq.heappush(heap, (priority(nxt), tie, nxt))
+            tie += 1
+
+    if not found:
+        if erasable_start:
+            result["member"], result["reason"] = None, "erasable_start"
+        return result
+
+    chain: List[str] = []
+    node: Optional[str] = target
+    while node is not None:
+        chain.append(node)
+        node = parent[node]
+    # En la búsqueda inversa la cadena de padres ya va de S hacia word
+    result["derivation"] = chain if direction == "reverse" else chain[::-1]
+    result["member"] = True
+    return result
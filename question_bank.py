@@ -0,0 +1,309 @@
+from typing import Dict, List, Optional, Tuple
+from functools import lru_cache
+from math import gcd
+import gzip
+import json
+import os
+import random
+
+from grammar_parser import parse_grammar
+from classifier import classify_grammar, classify_automaton_kind
+
+# Banco precalculado de preguntas del modo tutor: se genera una vez con
+# `python question_bank.py` y se guarda comprimido junto al código.
+BANK_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "question_bank.json.gz")
+BANK_VERSION = 2
+
+FIELDS = ["kind", "text", "type", "size", "difficulty"]
+KINDS = {"g": "Gramática", "a": "Autómata"}
+DIFFICULTY_LABELS = {1: "Fácil", 2: "Media", 3: "Difícil"}
+ANY = "*"
+
+_NONTERMINALS = "SABCD"
+_TERMINALS = "abc"
+
+
+#GENERACIÓN DE GRAMÁTICAS
+def _format_grammar(rules: List[Tuple[str, str]]) -> str:
+    grouped: Dict[str, List[str]] = {}
+    for left, rhs in rules:
+        alts = grouped.setdefault(left, [])
+        if (rhs or "ε") not in alts:
+            alts.append(rhs or "ε")
+    return "\n".join(f"{left} -> " + " | ".join(alts) for left, alts in grouped.items())
+
+
+def _word(rng: random.Random, low: int = 1, high: int = 2) -> str:
+    return "".join(rng.choice(_TERMINALS) for _ in range(rng.randint(low, high)))
+
+
+def _regular_rules(rng: random.Random, nts: str) -> List[Tuple[str, str]]:
+    rules = []
+    for A in nts:
+        for _ in range(rng.randint(1, 3)):
+            shape = rng.random()
+            if shape < 0.55:
+                rules.append((A, _word(rng) + rng.choice(nts)))
+            elif shape < 0.9:
+                rules.append((A, _word(rng)))
+            else:
+                rules.append((A, ""))
+    return rules
+
+
+def _context_free_rules(rng: random.Random, nts: str) -> List[Tuple[str, str]]:
+    rules = _regular_rules(rng, nts)
+    A, B = rng.choice(nts), rng.choice(nts)
+    t, u = rng.choice(_TERMINALS), rng.choice(_TERMINALS)
+    rules.append(rng.choice([
+        (A, f"{t}{B}{u}"),
+        (A, f"{B}{A}"),
+        (A, f"{A}{A}"),
+        (A, f"{t}{A}{u}{B}"),
+        (A, f"{B}{t}"),
+    ]))
+    return rules
+
+
+def _context_sensitive_rules(rng: random.Random, nts: str) -> List[Tuple[str, str]]:
+    # Sin ε (salvo S) para que ninguna regla sea contractiva
+    rules = [(l, r) for l, r in _context_free_rules(rng, nts) if r or l == "S"]
+    for _ in range(rng.randint(1, 2)):
+        A, B = rng.choice(nts), rng.choice(nts)
+        t = rng.choice(_TERMINALS)
+        rules.append(rng.choice([
+            (f"{A}{B}", f"{B}{A}") if A != B else (f"{A}{B}", f"{A}{t}{B}"),
+            (f"{t}{B}", f"{t}{t}"),
+            (f"{A}{B}", f"{A}{t}{B}"),
+            (f"{t}{A}", f"{t}{B}{t}"),
+        ]))
+    return rules
+
+
+def _unrestricted_rules(rng: random.Random, nts: str) -> List[Tuple[str, str]]:
+    rules = _context_free_rules(rng, nts)
+    A, B = rng.choice(nts), rng.choice(nts)
+    t = rng.choice(_TERMINALS)
+    rules.append(rng.choice([
+        (f"{A}{B}", t),
+        (f"{t}{A}", ""),
+        (f"{A}{B}", B),
+        (f"{A}{t}{B}", f"{t}{t}"),
+    ]))
+    return rules
+
+
+_GRAMMAR_MAKERS = {
+    3: _regular_rules,
+    2: _context_free_rules,
+    1: _context_sensitive_rules,
+    0: _unrestricted_rules,
+}
+
+
+def _grammar_difficulty(rules: List[Tuple[str, str]]) -> int:
+    # Solo rasgos que no dependen del tipo (tamaño, no terminales, regla más larga):
+    # la dificultad no debe delatar la respuesta
+    nonterminals = {ch for l, r in rules for ch in l + r if ch.isupper()}
+    score = len(rules) + len(nonterminals) + max(len(l) + len(r) for l, r in rules)
+    return 1 if score <= 10 else 2 if score <= 14 else 3
+
+
+#GENERACIÓN DE AUTÓMATAS
+def _random_automaton(rng: random.Random, kind: str) -> Dict:
+    n = rng.randint(2, 5)
+    states = [f"q{i}" for i in range(n)]
+    alphabet = ["a", "b"]
+    automaton: Dict = {
+        "type": kind,
+        "states": states,
+        "alphabet": alphabet,
+        "start": "q0",
+        "accepting": sorted(rng.sample(states, rng.randint(1, max(1, n // 2)))),
+        "transitions": {},
+    }
+    for q in states:
+        row: Dict = {}
+        for a in alphabet:
+            if kind == "AFD":
+                row[a] = rng.choice(states)
+            elif kind == "AFN":
+                row[a] = sorted(rng.sample(states, rng.randint(1, 2)))
+            elif kind == "AP":
+                row[f"{a}, Z / {a.upper()}Z"] = rng.choice(states)
+            else:
+                row[f"{a} / {rng.choice(alphabet)}, {rng.choice('LR')}"] = rng.choice(states)
+        if kind == "AFN" and rng.random() < 0.4:
+            row["ε"] = [rng.choice(states)]
+        if kind == "AP" and rng.random() < 0.5:
+            row["ε, Z / ε"] = rng.choice(states)
+        automaton["transitions"][q] = row
+    if kind == "AP":
+        automaton["stack_alphabet"] = ["Z", "A", "B"]
+    if kind == "MT":
+        automaton["tape_alphabet"] = ["a", "b", "□"]
+        automaton["blank"] = "□"
+    return automaton
+
+
+def _automaton_difficulty(automaton: Dict) -> int:
+    n = len(automaton["states"])
+    return 1 if n <= 2 else 2 if n <= 4 else 3
+
+
+
+
+#CONSTRUCCIÓN Y ALMACENAMIENTO
+def _bucket(kind: str, type_id, difficulty) -> str:
+    return f"{kind}|{type_id}|{difficulty}"
+
+
+def _balance(items: List[List], per_type: Dict[str, int], rng: random.Random) -> List[List]:
+    """
+    Deja en cada grupo (tipo de pregunta, dificultad) el mismo número de
+    preguntas de cada tipo de Chomsky, como mucho per_type[kind]: así elegir
+    una dificultad no hace más probable ninguna respuesta.
+    """
+    groups: Dict[Tuple[str, int], Dict[int, List[List]]] = {}
+    types_of: Dict[str, set] = {}
+    for item in items:
+        kind, _, type_id, _, difficulty = item
+        groups.setdefault((kind, difficulty), {}).setdefault(type_id, []).append(item)
+        types_of.setdefault(kind, set()).add(type_id)
+
+    balanced: List[List] = []
+    for (kind, _), by_type in sorted(groups.items()):
+        if set(by_type) != types_of[kind]:
+            continue  # falta algún tipo: el grupo delataría la respuesta
+        n = min(per_type[kind], *(len(v) for v in by_type.values()))
+        for type_id in sorted(by_type):
+            balanced.extend(rng.sample(by_type[type_id], n))
+    return balanced
+
+
+def build_question_bank(grammars_per_type: int = 500, automata_per_kind: int = 150, seed: int = 2024) -> Dict:
+    """
+    Genera el banco: gramáticas y autómatas aleatorios, clasificados con
+    classify_grammar / classify_automaton_kind (la respuesta guardada es la
+    del clasificador, no la intención del generador) e indexados por
+    tipo de pregunta, tipo de Chomsky y dificultad.
+
+    Se generan candidatas de sobra y _balance reparte los tipos por igual en
+    cada dificultad. El tamaño se guarda en cada pregunta pero no se indexa:
+    filtrar por tamaño volvería a insinuar el tipo.
+    """
+    rng = random.Random(seed)
+    items: List[List] = []
+    seen = set()
+
+    candidates = grammars_per_type * 3
+    for intended, maker in _GRAMMAR_MAKERS.items():
+        produced, attempts = 0, 0
+        while produced < candidates and attempts < candidates * 50:
+            attempts += 1
+            nts = _NONTERMINALS[:rng.choice((1, 2, 2, 3, 3, 4))]
+            text = _format_grammar(maker(rng, nts))
+            if text in seen:
+                continue
+            grammar = parse_grammar(text)
+            type_id, _ = classify_grammar(grammar)
+            if type_id != intended:
+                continue
+            seen.add(text)
+            rules = grammar["productions"]
+            items.append(["g", text, type_id, len(rules), _grammar_difficulty(rules)])
+            produced += 1
+
+    for kind in ("AFD", "AFN", "AP", "MT"):
+        produced, attempts = 0, 0
+        while produced < automata_per_kind * 2 and attempts < automata_per_kind * 100:
+            attempts += 1
+            automaton = _random_automaton(rng, kind)
+            type_id, _ = classify_automaton_kind(automaton)
+            # En la pregunta no se muestra el campo "type": hay que deducirlo
+            shown = {k: v for k, v in automaton.items() if k != "type"}
+            text = json.dumps(shown, ensure_ascii=False, separators=(",", ":"))
+            if text in seen:
+                continue
+            seen.add(text)
+            items.append(["a", text, type_id, len(automaton["states"]), _automaton_difficulty(automaton)])
+            produced += 1
+
+    # Una dificultad por tercio del objetivo; los autómatas de Tipo 3 (AFD y AFN)
+    # cuentan como un solo tipo
+    items = _balance(items, {"g": grammars_per_type // 3, "a": automata_per_kind // 3}, rng)
+
+    index: Dict[str, List[int]] = {}
+    for i, (kind, _, type_id, _, difficulty) in enumerate(items):
+        for k in (kind, ANY):
+            for t in (type_id, ANY):
+                for d in (difficulty, ANY):
+                    index.setdefault(_bucket(k, t, d), []).append(i)
+
+    return {"version": BANK_VERSION, "fields": FIELDS, "items": items, "index": index}
+
+
+def save_question_bank(bank: Dict, path: str = BANK_PATH) -> str:
+    with gzip.open(path, "wt", encoding="utf-8") as f:
+        json.dump(bank, f, ensure_ascii=False, separators=(",", ":"))
+    return path
+
+
+@lru_cache(maxsize=4)
+def load_question_bank(path: str = BANK_PATH) -> Dict:
+    """
+    Carga el banco una sola vez por proceso (lo comparten todas las sesiones).
+    """
+    try:
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            bank = json.load(f)
+    except OSError as e:
+        raise ValueError(f"No se pudo leer el banco de preguntas ({path}): {e}")
+    if bank.get("version") != BANK_VERSION:
+        raise ValueError("El banco de preguntas tiene una versión distinta; regenéralo con `python question_bank.py`.")
+    return bank
+
+
+#SERVICIO DE PREGUNTAS
+def next_question(
+    state: Dict,
+    kind: str = ANY,
+    type_id=ANY,
+    difficulty=ANY,
+    rng: Optional[random.Random] = None,
+) -> Optional[Dict]:
+    """
+    Devuelve la siguiente pregunta del grupo pedido sin repetir ninguna hasta
+    haberlas servido todas. `state` es un diccionario por sesión (p. ej. en
+    st.session_state); en él se guarda para cada grupo una permutación afín
+    i -> (inicio + i·paso) mod n con paso coprimo con n, así cada pregunta
+    cuesta O(1) sin barajar ni copiar listas.
+    Devuelve None si no hay preguntas con esos filtros.
+    """
+    bank = load_question_bank()
+    key = _bucket(kind, type_id, difficulty)
+    ids = bank["index"].get(key)
+    if not ids:
+        return None
+    n = len(ids)
+    rng = rng or random
+    cursor = state.get(key)
+    if cursor is None or cursor["served"] >= n:
+        stride = 1
+        if n > 2:
+            stride = rng.randrange(1, n)
+            while gcd(stride, n) != 1:
+                stride = rng.randrange(1, n)
+        cursor = {"offset": rng.randrange(n), "stride": stride, "served": 0}
+        state[key] = cursor
+    item = bank["items"][ids[(cursor["offset"] + cursor["served"] * cursor["stride"]) % n]]
+    cursor["served"] += 1
+    question = dict(zip(bank["fields"], item))
+    question["answer"] = f"Tipo {question['type']}"
+    return question
+
+
+if __name__ == "__main__":
+    bank = build_question_bank()
+    path = save_question_bank(bank)
+    print(f"{len(bank['items'])} preguntas guardadas en {path}")
@@ -0,0 +1,76 @@
+"""
+generate_strings es una búsqueda de mejor primero con poda por longitud mínima;
+aquí se compara con la exploración en anchura original (derivaciones más a la
+izquierda, profundidad <= max_steps) sobre gramáticas aleatorias con semilla fija.
+"""
+import random
+from typing import Dict, Set
+
+import pytest
+
+from classifier import generate_strings
+from grammar_parser import parse_grammar
+
+SEED = 33
+N_GRAMMARS = 2300
+
+
+def _reference_strings(grammar: Dict, max_len: int, max_steps: int) -> Set[str]:
+    """
+    La búsqueda FIFO de referencia, por niveles: las formas repetidas en un mismo
+    nivel se exploran una vez (no cambia el resultado, solo evita la explosión).
+    """
+    nonterminals = set(grammar["nonterminals"])
+    results: Set[str] = set()
+    level = {grammar["start"]}
+    for steps in range(max_steps + 1):
+        following = set()
+        for current in level:
+            idx = next((i for i, ch in enumerate(current) if ch in nonterminals), None)
+            if idx is None:
+                if 0 < len(current) <= max_len:
+                    results.add(current)
+                continue
+            if len(current) > max_len + 2:
+                continue
+            for left, rhs in grammar["productions"]:
+                if left == current[idx]:
+                    following.add(current[:idx] + rhs + current[idx + 1:])
+        level = following
+    return results
+
+
+def _grammar_text(rng: random.Random) -> str:
+    nts = "SAB"[:rng.randint(1, 3)]
+    rules = {}
+    for A in nts:
+        for _ in range(rng.randint(1, 3)):
+            rhs = "".join(rng.choice(nts + "ab") for _ in range(rng.randint(0, 3)))
+            rules.setdefault(A, []).append(rhs or "ε")
+    return "\n".join(f"{A} -> " + " | ".join(alts) for A, alts in rules.items())
+
+
+def _cases():
+    rng = random.Random(SEED)
+    return [
+        (_grammar_text(rng), rng.randint(2, 7), rng.randint(3, 10))
+        for _ in range(N_GRAMMARS)
+    ]
+
+
+CASES = _cases()
+
+
+@pytest.mark.parametrize("chunk", range(4))
+def test_generate_strings_matches_fifo_reference(chunk):
+    for text, max_len, max_steps in CASES[chunk::4]:
+        grammar = parse_grammar(text)
+        expected = _reference_strings(grammar, max_len, max_steps)
+        assert generate_strings(grammar, max_len=max_len, max_steps=max_steps) == expected, (
+            text, max_len, max_steps
+        )
+
+
+def test_generate_strings_ignores_non_context_free_rules():
+    grammar = parse_grammar("S -> aSB | ab\naB -> ab\nbB -> bb")
+    assert generate_strings(grammar, max_len=6, max_steps=8) == _reference_strings(grammar, 6, 8)
@@ -0,0 +1,85 @@
+"""
+Comprueba language_summary, yield_tables y el conteo exacto de gramáticas
+regulares contra la enumeración por longitud de ambiguity.language_by_length,
+sobre gramáticas aleatorias con semilla fija.
+"""
+import random
+
+import pytest
+
+from ambiguity import language_by_length
+from classifier import classify_grammar
+from grammar_analysis import language_summary, yield_tables
+from grammar_parser import parse_grammar
+
+SEED = 2024
+N_GRAMMARS = 3000
+MAX_LEN = 7
+
+
+def _grammar_text(rng: random.Random, regular: bool) -> str:
+    nts = "SABC"[:rng.randint(1, 4)]
+    rules = {}
+    for A in nts:
+        for _ in range(rng.randint(1, 3)):
+            if regular:
+                word = "".join(rng.choice("ab") for _ in range(rng.randint(0, 2)))
+                rhs = word + (rng.choice(nts) if rng.random() < 0.6 else "")
+            else:
+                rhs = "".join(rng.choice(nts + "ab") for _ in range(rng.randint(0, 3)))
+            rules.setdefault(A, []).append(rhs or "ε")
+    return "\n".join(f"{A} -> " + " | ".join(alts) for A, alts in rules.items())
+
+
+def _random_grammars():
+    rng = random.Random(SEED)
+    return [parse_grammar(_grammar_text(rng, regular=i % 2 == 0)) for i in range(N_GRAMMARS)]
+
+
+GRAMMARS = _random_grammars()
+
+
+@pytest.mark.parametrize("chunk", range(5))
+def test_summary_matches_enumeration(chunk):
+    for grammar in GRAMMARS[chunk::5]:
+        text = grammar["productions"]
+        by_length = language_by_length(grammar, MAX_LEN)
+        lengths = [n for n, strings in by_length.items() if strings]
+        summary = language_summary(grammar)
+        tables = yield_tables(grammar)
+        min_yield = tables["min_yield"].get(grammar["start"])
+
+        if summary["empty"]:
+            assert not lengths, text
+            continue
+
+        assert summary["contains_epsilon"] == ("" in by_length[0]), text
+
+        # La cadena más corta: su longitud es la primera con cadenas y pertenece al lenguaje
+        if min_yield <= MAX_LEN:
+            assert lengths and lengths[0] == min_yield, text
+            assert tables["shortest"][grammar["start"]] in by_length[min_yield], text
+        else:
+            assert not lengths, text
+
+        if summary["finite"] and summary["max_length"] <= MAX_LEN:
+            assert lengths[-1] == summary["max_length"], text
+
+        if summary["size_by_length"] is not None and summary["max_length"] <= MAX_LEN:
+            # Solo gramáticas regulares finitas; se ignoran las longitudes sin cadenas
+            expected = {n: len(by_length[n]) for n in lengths}
+            counted = {n: c for n, c in summary["size_by_length"].items() if c}
+            assert counted == expected, text
+
+
+def test_exact_counts_cover_regular_finite_grammars():
+    counted = 0
+    for grammar in GRAMMARS:
+        summary = language_summary(grammar)
+        if summary["empty"] or not summary["finite"]:
+            continue
+        if classify_grammar(grammar)[0] == 3:
+            assert summary["size_by_length"] is not None, grammar["productions"]
+            counted += 1
+    # La muestra debe ejercitar de verdad el conteo exacto
+    assert counted > 50
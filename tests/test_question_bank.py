@@ -0,0 +1,28 @@
+"""
+El banco del modo tutor: la dificultad no debe delatar el tipo y las preguntas
+de un grupo no se repiten hasta haberlas servido todas.
+"""
+import random
+from collections import Counter
+
+from question_bank import ANY, load_question_bank, next_question
+
+
+def test_types_are_balanced_in_every_difficulty():
+    bank = load_question_bank()
+    spread = {}
+    for kind, _, type_id, _, difficulty in bank["items"]:
+        spread.setdefault((kind, difficulty), Counter())[type_id] += 1
+    for (kind, difficulty), counts in spread.items():
+        assert len(set(counts.values())) == 1, (kind, difficulty, dict(counts))
+        assert len(counts) == (4 if kind == "g" else 3), (kind, difficulty, dict(counts))
+
+
+def test_next_question_serves_each_item_once_per_round():
+    bank = load_question_bank()
+    state = {}
+    rng = random.Random(0)
+    n = len(bank["index"]["g|*|1"])
+    served = [next_question(state, kind="g", difficulty=1, rng=rng)["text"] for _ in range(n)]
+    assert len(set(served)) == n
+    assert next_question(state, kind="g", type_id=ANY, difficulty=1, rng=rng) is not None
@@ -0,0 +1,174 @@
+"""
+Presupuesto de arranque: Streamlit vuelve a ejecutar main.py en cada
+interacción, así que los módulos que importa cada modo deben cargarse rápido.
+Cada medición se hace en un intérprete nuevo con `python -X importtime`.
+
+Los módulos de cada modo se leen de main.py (imports de primer nivel y los de
+la rama `mode == ...`), más los imports locales de las funciones del proyecto
+que esa rama usa, así la lista no se desfasa del código.
+"""
+import ast
+import os
+import subprocess
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MAIN = os.path.join(ROOT, "main.py")
+
+# Presupuesto (en milisegundos) para importar los módulos de un modo; en máquinas
+# de CI lentas se puede ampliar con la variable de entorno IMPORT_BUDGET_MS
+IMPORT_BUDGET_MS = float(os.environ.get("IMPORT_BUDGET_MS", 150))
+
+# Nada de esto debe cargarse solo por importar el clasificador
+HEAVY_MODULES = ["multiprocessing", "concurrent.futures", "networkx", "reportlab", "graphviz", "streamlit"]
+
+
+def _is_project(module: str) -> bool:
+    return os.path.exists(os.path.join(ROOT, module.split(".")[0] + ".py"))
+
+
+def _is_measured(module: str) -> bool:
+    # Módulos del proyecto y de la biblioteca estándar (streamlit se mide aparte)
+    return _is_project(module) or module.split(".")[0] in sys.stdlib_module_names
+
+
+def _imports(nodes):
+    """
+    (módulo, nombres importados) de cada import dentro de los nodos dados.
+    """
+    found = []
+    for node in nodes:
+        for sub in ast.walk(node):
+            if isinstance(sub, ast.Import):
+                found.extend((alias.name, []) for alias in sub.names)
+            elif isinstance(sub, ast.ImportFrom) and sub.module and not sub.level:
+                found.append((sub.module, [alias.name for alias in sub.names]))
+    return found
+
+
+def _function_imports(module: str, names):
+    """
+    Módulos que importan localmente las funciones `names` de un módulo del proyecto.
+    """
+    with open(os.path.join(ROOT, module + ".py"), encoding="utf-8") as f:
+        tree = ast.parse(f.read())
+    functions = [
+        node for node in tree.body
+        if isinstance(node, ast.FunctionDef) and node.name in names
+    ]
+    return [m for m, _ in _imports(functions)]
+
+
+def _mode_modules():
+    """
+    {etiqueta del modo: módulos a importar}, con "base" para los imports de primer nivel.
+    """
+    with open(MAIN, encoding="utf-8") as f:
+        tree = ast.parse(f.read())
+
+    base = [m for m, _ in _imports(n for n in tree.body if isinstance(n, (ast.Import, ast.ImportFrom)))]
+    modes = {"base": base}
+
+    branch = next(
+        (n for n in tree.body if isinstance(n, ast.If) and "mode" in ast.unparse(n.test)), None
+    )
+    while isinstance(branch, ast.If):
+        label = ast.literal_eval(branch.test.comparators[0])
+        modules = list(base)
+        for module, names in _imports(branch.body):
+            modules.append(module)
+            if _is_project(module) and names:
+                modules.extend(_function_imports(module, names))
+        modes[label] = modules
+        branch = branch.orelse[0] if len(branch.orelse) == 1 else None
+
+    return {
+        label: sorted({m for m in modules if _is_measured(m)})
+        for label, modules in modes.items()
+    }
+
+
+MODES = _mode_modules()
+
+
+def _run(code: str, *flags: str, check: bool = True) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, *flags, "-c", code],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=check,
+    )
+
+
+def _importable(modules):
+    """
+    Separa los módulos que se pueden importar de los que fallan (p. ej. visualizer sin graphviz).
+    """
+    code = (
+        "import importlib\n"
+        f"for m in {modules!r}:\n"
+        "    try:\n"
+        "        importlib.import_module(m)\n"
+        "    except ImportError:\n"
+        "        print(m)\n"
+    )
+    missing = set(_run(code).stdout.split())
+    return [m for m in modules if m not in missing], sorted(missing)
+
+
+def _import_time_ms(modules) -> float:
+    """
+    Suma el tiempo acumulado de los imports de primer nivel de `modules`
+    según la salida de -X importtime (en microsegundos).
+    """
+    code = "import " + ", ".join(modules)
+    _run(code)  # primera ejecución: genera los .pyc
+    stderr = _run(code, "-X", "importtime").stderr
+
+    wanted = set(modules) | {m.split(".")[0] for m in modules}
+    total_us = 0
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        # Solo los módulos pedidos directamente (sin sangría en la columna del nombre)
+        if name.startswith("  "):
+            continue
+        if name.strip() in wanted:
+            total_us += int(cumulative)
+    return total_us / 1000
+
+
+def test_every_mode_of_main_is_measured():
+    with open(MAIN, encoding="utf-8") as f:
+        tree = ast.parse(f.read())
+    radio = next(
+        n for n in ast.walk(tree)
+        if isinstance(n, ast.Call) and ast.unparse(n.func) == "st.sidebar.radio"
+    )
+    options = ast.literal_eval(radio.args[1])
+    assert sorted(options) == sorted(label for label in MODES if label != "base")
+
+
+@pytest.mark.parametrize("mode", sorted(MODES))
+def test_mode_import_budget(mode):
+    modules, missing = _importable(MODES[mode])
+    if not any(_is_project(m) for m in modules):
+        pytest.skip(f"Faltan dependencias para importar: {', '.join(missing)}")
+    elapsed = _import_time_ms(modules)
+    assert elapsed < IMPORT_BUDGET_MS, (
+        f"Importar el modo {mode} ({', '.join(modules)}) tarda {elapsed:.1f} ms "
+        f"(presupuesto: {IMPORT_BUDGET_MS:g} ms)"
+    )
+
+
+def test_classifier_does_not_load_heavy_modules():
+    code = (
+        "import sys, classifier\n"
+        f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    )
+    loaded = _run(code).stdout.strip()
+    assert loaded == "", f"import classifier carga módulos pesados: {loaded}"
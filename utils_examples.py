@@ -1,4 +1,4 @@
-from typing import Dict
+from typing import Dict, Optional
 from classifier import TYPE_LABELS, get_random_example_by_type
 
 def get_example_grammar_text(type_id: int) -> str:
@@ -7,3 +7,19 @@ def get_example_grammar_text(type_id: int) -> str:
 
 def pretty_print_classification(type_id: int) -> str:
     return TYPE_LABELS.get(type_id, "Tipo desconocido")
+
+
+def describe_language(summary: Optional[Dict]) -> str:
+    """
+    Texto corto a partir de grammar_analysis.language_summary.
+    """
+    if summary is None:
+        return "No se analiza (la gramática no es libre de contexto)."
+    if summary["empty"]:
+        return "Lenguaje vacío: el símbolo inicial no deriva ninguna cadena."
+    if not summary["finite"]:
+        return "Lenguaje infinito."
+    text = f"Lenguaje finito (cadena más larga: {summary['max_length']} símbolos)"
+    if summary["size"] is not None:
+        text += f", con exactamente {summary['size']} cadenas"
+    return text + "."
@@ -1,6 +1,8 @@
-from typing import Dict
+from typing import Dict, TYPE_CHECKING
 import graphviz
-import networkx as nx
+
+if TYPE_CHECKING:
+    import networkx as nx
 
 def grammar_to_graphviz(grammar: Dict) -> graphviz.Digraph:
     """
@@ -41,15 +43,21 @@ def automaton_to_graphviz(automaton: Dict) -> graphviz.Digraph:
 
     for src, trans in transitions.items():
         for symbol, dst in trans.items():
-            dot.edge(src, dst, label=str(symbol))
+            # En un AFN cada símbolo puede llevar a una lista de estados
+            targets = dst if isinstance(dst, list) else [dst]
+            for d in targets:
+                dot.edge(src, d, label=str(symbol))
 
     return dot
 
 
-def graphviz_to_networkx(dot_source: str) -> nx.DiGraph:
+def graphviz_to_networkx(dot_source: str) -> "nx.DiGraph":
     """
     Conversión opcional a networkx si se quiere hacer algo más avanzado.
+    networkx se importa aquí para no cargarlo cuando solo se dibuja con Graphviz.
     """
+    import networkx as nx
+
     G = nx.DiGraph()
     lines = dot_source.splitlines()
     for line in lines: